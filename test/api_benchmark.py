@@ -0,0 +1,200 @@
+import json
+import math
+import os
+import time
+
+from rate_limit import file_lock
+
+
+class LatencyHistogram:
+    """Гистограмма задержек с логарифмическими корзинами.
+
+    Корзины растут в growth раз начиная с min_ms, поэтому точность
+    перцентилей относительная (около 5%) при любом числе замеров.
+    """
+
+    def __init__(self, min_ms=0.05, growth=1.05):
+        self.min_ms = min_ms
+        self.growth = growth
+        self.buckets = {}
+        self.count = 0
+
+    def record(self, ms):
+        index = max(int(math.log(max(ms, self.min_ms) / self.min_ms,
+                                 self.growth)), 0)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+
+    def percentile(self, q):
+        """Верхняя граница корзины, в которую попадает q-й перцентиль."""
+        if not self.count:
+            return None
+        rank = math.ceil(self.count * q / 100)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return self.min_ms * self.growth ** (index + 1)
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+def mann_whitney_greater(sample, baseline):
+    """p-value одностороннего U-критерия Манна-Уитни: sample > baseline.
+
+    Нормальная аппроксимация с поправками на связи и непрерывность;
+    подходит для выборок от ~20 замеров.
+    """
+    n1, n2 = len(sample), len(baseline)
+    values = sorted(
+        [(value, 0) for value in sample] + [(value, 1) for value in baseline])
+    ranks = [0.0] * len(values)
+    ties = 0.0
+    start = 0
+    while start < len(values):
+        end = start
+        value = values[start][0]
+        while end + 1 < len(values) and values[end + 1][0] == value:
+            end += 1
+        for index in range(start, end + 1):
+            ranks[index] = (start + end) / 2 + 1
+        size = end - start + 1
+        ties += size ** 3 - size
+        start = end + 1
+
+    rank_sum = sum(
+        rank for rank, (_, group) in zip(ranks, values) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+class BenchmarkResult:
+    """Замеры одного эндпоинта и итог сравнения с базовой линией."""
+
+    def __init__(self, name, samples, histogram, baseline=None):
+        self.name = name
+        self.samples = samples
+        self.histogram = histogram
+        self.summary = histogram.summary()
+        self.baseline = baseline
+        self.p_value = None
+        self.regression = None
+
+    def compare(self, alpha=0.01, threshold=0.1):
+        """Регрессия: статистически значимый и заметный рост медианы."""
+        if not self.baseline:
+            return None
+        base = LatencyHistogram()
+        for ms in self.baseline:
+            base.record(ms)
+        base_p50 = base.percentile(50)
+        self.p_value = mann_whitney_greater(self.samples, self.baseline)
+        growth = self.summary["p50"] / base_p50 - 1
+        if self.p_value < alpha and growth > threshold:
+            self.regression = (
+                f"{self.name}: p50 {self.summary['p50']:.2f} мс против "
+                f"{base_p50:.2f} мс в базовой линии (+{growth:.0%}, "
+                f"p = {self.p_value:.2g})")
+        return self.regression
+
+    def report(self):
+        return {"name": self.name, **self.summary, "p_value": self.p_value,
+                "regression": self.regression}
+
+
+class APIBenchmark:
+    """Замер задержек эндпоинтов и сравнение с сохраненной базовой линией.
+
+    Базовая линия хранит сырые замеры по цели (live или stand-in) и
+    эндпоинту, чтобы сравнение шло по всему распределению, а не по одному
+    числу.
+    """
+
+    def __init__(self, baseline_path, target, warmup=5, iterations=50,
+                 alpha=0.01, threshold=0.1):
+        self.baseline_path = str(baseline_path)
+        self.target = target
+        self.warmup = warmup
+        self.iterations = iterations
+        self.alpha = alpha
+        self.threshold = threshold
+        self.results = {}
+        self._baseline = self._load().get(target, {})
+
+    def run(self, name, call):
+        """Прогрев и замер call(); результат с проверкой на регрессию."""
+        for _ in range(self.warmup):
+            call()
+
+        samples = []
+        histogram = LatencyHistogram()
+        for _ in range(self.iterations):
+            started = time.perf_counter()
+            call()
+            ms = (time.perf_counter() - started) * 1000
+            samples.append(ms)
+            histogram.record(ms)
+
+        result = BenchmarkResult(
+            name, samples, histogram, self._baseline.get(name))
+        result.compare(self.alpha, self.threshold)
+        self.results[name] = result
+        return result
+
+    def save_baseline(self):
+        """Запись текущих замеров как базовой линии цели."""
+        with file_lock(self.baseline_path + ".lock"):
+            data = self._load()
+            target = data.setdefault(self.target, {})
+            for name, result in self.results.items():
+                target[name] = [round(ms, 3) for ms in result.samples]
+            tmp_path = self.baseline_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as baseline_file:
+                json.dump(data, baseline_file, indent=1)
+            os.replace(tmp_path, self.baseline_path)
+
+    def _load(self):
+        try:
+            with open(self.baseline_path, encoding="utf-8") as baseline_file:
+                return json.load(baseline_file)
+        except (OSError, ValueError):
+            return {}
+
+
+class BenchmarkReport:
+    """Плагин pytest: таблица перцентилей по эндпоинтам."""
+
+    def __init__(self):
+        self.results = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "call":
+            return
+        for name, value in report.user_properties:
+            if name == "api_benchmark":
+                self.results[value["name"]] = value
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.results:
+            return
+        terminalreporter.write_sep("-", "Задержки API, мс")
+        terminalreporter.write_line(
+            f"{'Эндпоинт':<12}{'N':>6}{'p50':>10}{'p95':>10}{'p99':>10}"
+            f"{'p-value':>10}")
+        for name, result in sorted(self.results.items()):
+            p_value = result["p_value"]
+            terminalreporter.write_line(
+                f"{name:<12}{result['count']:>6}{result['p50']:>10.2f}"
+                f"{result['p95']:>10.2f}{result['p99']:>10.2f}"
+                f"{'-' if p_value is None else f'{p_value:.2g}':>10}")
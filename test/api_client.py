@@ -0,0 +1,58 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+from rate_limit import retry_after_seconds
+
+
+class APIClient:
+    """Клиент API Kinopoisk поверх общего пула keep-alive соединений."""
+
+    def __init__(self, base_url, headers, pool_size=10, timeout=30,
+                 limiter=None, max_retries=3):
+        self.base_url = base_url
+        self.headers = headers
+        self.timeout = timeout
+        self.limiter = limiter
+        self.max_retries = max_retries
+
+        # Одна сессия на клиента: TCP+TLS рукопожатие выполняется
+        # один раз на соединение, а не на каждый запрос
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        self.session.headers.update({
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, endpoint, params=None):
+        """GET запрос к API."""
+        return self.request("GET", endpoint, params=params)
+
+    def post(self, endpoint, data=None):
+        """POST запрос к API."""
+        return self.request("POST", endpoint, json=data)
+
+    def request(self, method, endpoint, **kwargs):
+        """Выполнение запроса через общий пул соединений.
+
+        Если задан limiter, запрос ждет токен общей квоты, а на ответ 429
+        все воркеры ставятся на паузу по Retry-After и запрос повторяется.
+        """
+        url = f"{self.base_url}{endpoint}"
+        kwargs.setdefault("timeout", self.timeout)
+        if self.limiter is None:
+            return self.session.request(method, url, **kwargs)
+
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            response = self.session.request(method, url, **kwargs)
+            if response.status_code != 429 or attempt == self.max_retries:
+                return response
+            self.limiter.block(retry_after_seconds(response))
+
+    def close(self):
+        """Закрытие всех соединений пула."""
+        self.session.close()
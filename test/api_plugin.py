@@ -0,0 +1,323 @@
+"""Плагин pytest с фикстурами для API тестов.
+
+Зависит только от requests: модули записи/воспроизведения, ограничителя
+запросов и асинхронного клиента импортируются, только когда они включены.
+"""
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pytest
+
+from api_client import APIClient
+
+
+class Config:
+    """Конфигурационные параметры."""
+    API_URL = "https://kinopoiskapiunofficial.tech/api/v2.2/"
+    HEADERS = {
+        "X-API-KEY": "50884c19-4a50-4f26-86ca-8d3bf8b256ea",
+        "Content-Type": "application/json"
+    }
+    KINO_URL = "https://www.kinopoisk.ru"
+
+
+@pytest.fixture(scope="session")
+def api_store(request):
+    """Хранилище записанных ответов API для режимов record и replay."""
+    if request.config.getoption("--api-mode") == "live":
+        yield None
+        return
+
+    from api_replay import ResponseStore
+
+    path = Path(request.config.getoption("--api-store"))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    store = ResponseStore(path)
+    yield store
+    store.close()
+
+
+@pytest.fixture(scope="session")
+def api_base_url(request, api_store):
+    """Базовый URL API: живой сервис или локальная замена в режиме replay."""
+    if request.config.getoption("--api-mode") != "replay":
+        yield Config.API_URL
+        return
+
+    from api_replay import ReplayServer
+
+    server = ReplayServer(api_store).start()
+    yield server.url + urlsplit(Config.API_URL).path
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def api_limiter(request):
+    """Общий для всех xdist-воркеров ограничитель частоты запросов к API."""
+    return _rate_limiter(request.config)
+
+
+@pytest.fixture(autouse=True)
+def _api_priority_lane(request, api_limiter):
+    """Перевод запросов smoke-тестов в приоритетную полосу квоты."""
+    if api_limiter is not None:
+        smoke = request.node.get_closest_marker("smoke") is not None
+        api_limiter.lane = "smoke" if smoke else "default"
+
+
+@pytest.fixture(scope="session")
+def api_client(request, api_base_url, api_store, api_limiter):
+    """Фикстура для работы с API Kinopoisk.
+
+    Создается один раз на сессию (на каждый xdist-воркер) и переиспользует
+    keep-alive соединения между тестами.
+    """
+    client = _make_api_client(
+        request.config, request.config.getoption("--api-pool-size"),
+        api_base_url, api_store, api_limiter)
+    yield client
+    client.close()
+
+
+@pytest.fixture(scope="session")
+def async_api_client(request, api_base_url, api_store, api_limiter):
+    """Фикстура для пакетных асинхронных проверок API."""
+    from async_api_client import AsyncAPIClient
+
+    concurrency = request.config.getoption("--api-concurrency")
+    client = _make_api_client(
+        request.config, concurrency, api_base_url, api_store, api_limiter)
+    async_client = AsyncAPIClient(client, concurrency=concurrency)
+    yield async_client
+    async_client.close()
+    client.close()
+
+
+@pytest.fixture(scope="session")
+def api_benchmark(request):
+    """Замер задержек API (только с --api-benchmark)."""
+    config = request.config
+    if not config.getoption("--api-benchmark"):
+        pytest.skip("Бенчмарк API запускается с --api-benchmark")
+
+    from api_benchmark import APIBenchmark
+
+    # Замеры через локальную замену и через сеть сравниваются раздельно
+    target = ("stand-in" if config.getoption("--api-mode") == "replay"
+              else "live")
+    benchmark = APIBenchmark(
+        config.getoption("--benchmark-baseline"),
+        target,
+        warmup=config.getoption("--benchmark-warmup"),
+        iterations=config.getoption("--benchmark-iterations"),
+    )
+    yield benchmark
+    if config.getoption("--benchmark-save-baseline"):
+        benchmark.save_baseline()
+
+
+@pytest.fixture
+def film_dataset(request, dataset_shard):
+    """Шард внешнего набора фильмов (--dataset) с контрольной точкой."""
+    config = request.config
+    path = config.getoption("--dataset")
+    if not path:
+        pytest.skip("Набор фильмов задается опцией --dataset")
+
+    from catalogue_dataset import FilmDataset
+
+    dataset = FilmDataset(
+        path,
+        sample=config.getoption("--dataset-sample"),
+        seed=config.getoption("--dataset-seed"),
+        shard=dataset_shard,
+        shards=_dataset_shards(config),
+    )
+    if config.getoption("--dataset-resume"):
+        dataset.resume(config.cache.get(dataset.key, None))
+    yield dataset
+    # Контрольная точка для --dataset-resume хранится в кэше pytest
+    if _has_cache(config):
+        config.cache.set(dataset.key, dataset.position)
+
+
+def _make_api_client(config, pool_size, base_url, store, limiter):
+    """Создание клиента API с настройками из командной строки."""
+    client = APIClient(
+        base_url,
+        Config.HEADERS,
+        pool_size=pool_size,
+        timeout=config.getoption("--api-timeout"),
+        limiter=limiter,
+        max_retries=config.getoption("--api-max-retries"),
+    )
+    if config.getoption("--api-mode") == "record":
+        client.session.hooks["response"].append(store.record)
+    return client
+
+
+def _rate_limiter(config):
+    """Ограничитель запросов или None, если он выключен или не нужен."""
+    rate = config.getoption("--api-rate")
+    if not rate or config.getoption("--api-mode") == "replay":
+        return None
+    if not _has_cache(config):
+        raise pytest.UsageError(
+            "--api-rate: общая квота воркеров хранится в кэше pytest, "
+            "он отключен (-p no:cacheprovider)")
+    from rate_limit import RateLimiter
+
+    path = config.cache.mkdir("api-rate-limit") / "state.json"
+    return RateLimiter(path, rate, burst=config.getoption("--api-burst"))
+
+
+def _has_cache(config):
+    # Без кэша pytest (-p no:cacheprovider) общее состояние хранить негде
+    return getattr(config, "cache", None) is not None
+
+
+def _dataset_shards(config):
+    """Число шардов набора: из опции или по числу xdist-воркеров."""
+    shards = config.getoption("--dataset-shards")
+    if shards:
+        return shards
+    return getattr(config, "workerinput", {}).get("workercount", 1)
+
+
+def pytest_generate_tests(metafunc):
+    """Один тест на шард набора: число тестов не зависит от его размера."""
+    if "dataset_shard" in metafunc.fixturenames:
+        metafunc.parametrize(
+            "dataset_shard", range(_dataset_shards(metafunc.config)),
+            ids=lambda shard: f"shard{shard}")
+
+
+def pytest_runtest_setup(item):
+    """Тесты с маркером benchmark зависят от нагрузки машины и
+    запускаются только явно.
+    """
+    if (item.get_closest_marker("benchmark")
+            and not item.config.getoption("--api-benchmark")):
+        pytest.skip("Бенчмарк запускается с --api-benchmark")
+
+
+def pytest_configure(config):
+    """Регистрация маркеров и сброс общей квоты в начале запуска."""
+    config.addinivalue_line(
+        "markers", "smoke: приоритетная полоса квоты API")
+
+    config.addinivalue_line(
+        "markers", "benchmark: замеры производительности, выполняются "
+        "только с --api-benchmark")
+    if config.getoption("--api-benchmark"):
+        from api_benchmark import BenchmarkReport
+
+        config.pluginmanager.register(BenchmarkReport(), "api-benchmark")
+
+    if config.getoption("--dataset-resume") and not _has_cache(config):
+        raise pytest.UsageError(
+            "--dataset-resume: контрольная точка набора хранится в кэше "
+            "pytest, он отключен (-p no:cacheprovider)")
+
+    # Сбрасывает только главный процесс, до запуска xdist-воркеров
+    limiter = _rate_limiter(config)
+    if limiter is not None and not hasattr(config, "workerinput"):
+        limiter.reset()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Счетчики ограничителя запросов к API."""
+    limiter = _rate_limiter(config)
+    if limiter is None:
+        return
+    stats = limiter.stats()
+    terminalreporter.write_sep("-", "API rate limit")
+    terminalreporter.write_line(
+        f"Запросов: {stats['requests']}, "
+        f"ожидали квоту: {stats['throttled']} "
+        f"({stats['throttled_seconds']:.1f} с), "
+        f"ответов 429: {stats['rate_limited']}")
+
+
+def pytest_addoption(parser):
+    """Добавляем опции для работы с API."""
+    parser.addoption(
+        "--api-pool-size", action="store", type=int, default=10,
+        help="Размер пула keep-alive соединений к API"
+    )
+    parser.addoption(
+        "--api-timeout", action="store", type=float, default=30,
+        help="Таймаут запроса к API по умолчанию, секунды"
+    )
+    parser.addoption(
+        "--api-concurrency", action="store", type=int, default=20,
+        help="Число одновременных запросов в пакетных проверках API"
+    )
+    parser.addoption(
+        "--api-mode", action="store", default="live",
+        choices=["live", "record", "replay"],
+        help="Режим API: live - живой сервис, record - запись ответов, "
+             "replay - воспроизведение записанных ответов без сети"
+    )
+    parser.addoption(
+        "--api-store", action="store",
+        default=str(Path(__file__).parent / "data" / "api_records.sqlite3"),
+        help="Файл хранилища записанных ответов API"
+    )
+    parser.addoption(
+        "--api-rate", action="store", type=float, default=0,
+        help="Общий для всех воркеров лимит запросов к API в секунду "
+             "(0 - без ограничения)"
+    )
+    parser.addoption(
+        "--api-burst", action="store", type=float, default=None,
+        help="Размер ведра токенов (по умолчанию равен --api-rate)"
+    )
+    parser.addoption(
+        "--api-max-retries", action="store", type=int, default=3,
+        help="Число повторов запроса после ответа 429"
+    )
+    parser.addoption(
+        "--api-benchmark", action="store_true",
+        help="Запустить бенчмарки: задержки API (test_api_benchmark.py) и "
+             "другие тесты с маркером benchmark"
+    )
+    parser.addoption(
+        "--benchmark-iterations", action="store", type=int, default=50,
+        help="Число замеров на эндпоинт"
+    )
+    parser.addoption(
+        "--benchmark-warmup", action="store", type=int, default=5,
+        help="Число прогревочных запросов на эндпоинт"
+    )
+    parser.addoption(
+        "--benchmark-baseline", action="store",
+        default=str(Path(__file__).parent / "data"
+                    / "api_benchmark_baseline.json"),
+        help="Файл базовой линии бенчмарка API"
+    )
+    parser.addoption(
+        "--benchmark-save-baseline", action="store_true",
+        help="Сохранить замеры как новую базовую линию"
+    )
+    parser.addoption(
+        "--dataset", action="store", default=None,
+        help="CSV или JSONL с ID фильмов и ожидаемыми полями "
+             "для test_catalogue_dataset"
+    )
+    parser.addoption(
+        "--dataset-sample", action="store", type=float, default=1.0,
+        help="Доля строк набора для проверки (0-1)"
+    )
+    parser.addoption(
+        "--dataset-seed", action="store", type=int, default=0,
+        help="Зерно выборки строк набора"
+    )
+    parser.addoption(
+        "--dataset-shards", action="store", type=int, default=0,
+        help="Число шардов набора (по умолчанию - число xdist-воркеров)"
+    )
+    parser.addoption(
+        "--dataset-resume", action="store_true",
+        help="Продолжить проверку набора с последней обработанной строки"
+    )
@@ -0,0 +1,119 @@
+import json
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+
+def request_key(method, url):
+    """Ключ записи: метод, путь и отсортированные параметры запроса."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {parts.path}?{query}"
+
+
+class ResponseStore:
+    """Индексированное хранилище записанных ответов API на базе SQLite.
+
+    Индекс по ключу позволяет не разбирать весь файл при открытии, а тела
+    ответов читаются только при обращении (через mmap SQLite).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            str(path), timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA mmap_size=268435456")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, status INTEGER, "
+            "content_type TEXT, body BLOB)")
+
+    def record(self, response, *args, **kwargs):
+        """Сохранение ответа (используется как response-хук requests)."""
+        key = request_key(response.request.method, response.request.url)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, response.status_code,
+                 response.headers.get("Content-Type", "application/json"),
+                 response.content))
+        return response
+
+    def lookup(self, method, url):
+        """Поиск записанного ответа: (status, content_type, body) или None."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT status, content_type, body FROM responses "
+                "WHERE key = ?", (request_key(method, url),)).fetchone()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            # Переносим WAL в основной файл, чтобы не оставлять -wal/-shm
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._db.close()
+
+
+class ReplayServer:
+    """Локальная замена API Kinopoisk, отдающая записанные ответы."""
+
+    def __init__(self, store, host="127.0.0.1", port=0):
+        handler = type("Handler", (_ReplayHandler,), {"store": store})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Заголовки и тело уходят отдельными пакетами: без TCP_NODELAY
+    # keep-alive соединение ждет delayed ACK (~40 мс на ответ)
+    disable_nagle_algorithm = True
+    store = None
+
+    def _replay(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        found = self.store.lookup(self.command, self.path)
+        if found is None:
+            status, content_type = 404, "application/json"
+            body = json.dumps({
+                "message": f"Ответ не записан: {self.command} {self.path}"
+            }, ensure_ascii=False).encode()
+        else:
+            status, content_type, body = found
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _replay
+
+    def log_message(self, format, *args):
+        pass
@@ -0,0 +1,557 @@
+"""Демон «теплых» браузеров, общий для запусков pytest.
+
+Демон держит пул уже запущенных headless-браузеров со стандартными
+опциями проекта. Фикстура driver с --browser-daemon берет браузер через
+локальный Unix-сокет, подключается к его сессии WebDriver и после теста
+возвращает обратно; очистку состояния (cookies, storage, окна) делает
+демон. Соединение держится до конца теста, поэтому браузер упавшего
+процесса pytest тоже возвращается в пул.
+
+Пример:
+    python test/browser_daemon.py start --max-size 4 --warm chrome:2 &
+    pytest test/test_ui.py --browser-daemon -n 4
+    python test/browser_daemon.py status
+    python test/browser_daemon.py stop
+"""
+import argparse
+import getpass
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from itertools import count
+from pathlib import Path
+
+
+# Манифест драйверов там же, где его ведет pytest, запущенный из корня
+DEFAULT_MANIFEST = Path(".pytest_cache") / "d" / "webdriver" / "manifest.json"
+
+# Сколько ждать освобождения браузера при заполненном пуле, секунды
+DEFAULT_WAIT = 30
+
+# Настройки запуска pytest по умолчанию (см. browsers.launch_profile)
+DEFAULT_PROFILE = {
+    "block_resources": None,
+    "block_url": [],
+    "page_load_strategy": "normal",
+}
+
+
+def default_socket():
+    """Сокет демона во временном каталоге, свой у каждого пользователя."""
+    try:
+        user = getpass.getuser()
+    except Exception:
+        # В контейнере может не быть ни USER, ни записи в passwd
+        user = os.getuid()
+    return os.path.join(
+        tempfile.gettempdir(), f"kinopoisk-browsers-{user}.sock")
+
+
+class DaemonError(Exception):
+    """Ошибка, которую вернул демон (например, браузер не запустился)."""
+
+
+class WarmBrowser:
+    """Браузер пула и его учет."""
+
+    _ids = count(1)
+
+    def __init__(self, key):
+        self.id = next(self._ids)
+        self.key = key
+        self.driver = None
+        self.state = "starting"
+        self.uses = 0
+        self.started = self.used = time.monotonic()
+
+    @property
+    def name(self):
+        return self.key[0]
+
+    def lease(self):
+        """Описание сессии для подключения клиента."""
+        return {
+            "id": self.id,
+            "browser": self.name,
+            "executor_url": self.driver.service.service_url,
+            "session_id": self.driver.session_id,
+            "capabilities": self.driver.caps,
+        }
+
+
+class WarmPool:
+    """Пул браузеров демона с лимитом размера и выгрузкой по простою.
+
+    Свободный браузер выдается только запросу с тем же браузером и
+    настройками запуска; если такой браузер как раз очищается, запрос
+    ждет его. Если подходящего нет, а пул заполнен, вместо самого давно
+    простаивающего браузера с другими настройками запускается новый;
+    если заняты все, запрос ждет освобождения.
+    """
+
+    def __init__(self, launcher, max_size=4, idle_timeout=600, max_uses=20):
+        self.launcher = launcher
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_uses = max_uses
+        self.browsers = []
+        self.counters = Counter()
+        self.busy_seconds = 0.0
+        self.started = time.monotonic()
+        self._condition = threading.Condition()
+
+    def acquire(self, browser, profile, wait=DEFAULT_WAIT):
+        """Занятый под тест WarmBrowser или None, если пул не освободился."""
+        key = (browser, json.dumps(profile, sort_keys=True))
+        deadline = time.monotonic() + wait
+        victim = None
+        with self._condition:
+            while True:
+                warm = self._take(key)
+                if warm is not None:
+                    self.counters["reused"] += 1
+                    return warm
+                # Очистка браузера быстрее запуска нового
+                resetting = any(
+                    warm.key == key and warm.state == "resetting"
+                    for warm in self.browsers)
+                if not resetting and len(self.browsers) >= self.max_size:
+                    victim = self._oldest_idle()
+                    if victim is not None:
+                        self.browsers.remove(victim)
+                        self.counters["evicted"] += 1
+                if not resetting and len(self.browsers) < self.max_size:
+                    warm = WarmBrowser(key)
+                    self.browsers.append(warm)
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.counters["timeouts"] += 1
+                    return None
+                self._condition.wait(remaining)
+
+        if victim is not None:
+            _quit(victim.driver)
+        self._launch(warm, browser, profile)
+        with self._condition:
+            self._lease(warm)
+        return warm
+
+    def prelaunch(self, browser, profile):
+        """Запуск свободного браузера заранее; False - пул заполнен."""
+        with self._condition:
+            if len(self.browsers) >= self.max_size:
+                return False
+            warm = WarmBrowser((browser, json.dumps(profile, sort_keys=True)))
+            self.browsers.append(warm)
+        self._launch(warm, browser, profile)
+        with self._condition:
+            warm.state = "idle"
+            warm.used = time.monotonic()
+            self._condition.notify_all()
+        return True
+
+    def release(self, warm, discard=False):
+        """Возврат браузера: очистка состояния или закрытие."""
+        with self._condition:
+            self.busy_seconds += time.monotonic() - warm.used
+            warm.state = "resetting"
+        healthy = (not discard and warm.uses < self.max_uses
+                   and _reset(warm.driver))
+        with self._condition:
+            if healthy:
+                warm.state = "idle"
+                warm.used = time.monotonic()
+            else:
+                self.browsers.remove(warm)
+            self._condition.notify_all()
+        if not healthy:
+            _quit(warm.driver)
+
+    def evict_idle(self):
+        """Закрытие браузеров, простаивающих дольше idle_timeout."""
+        now = time.monotonic()
+        with self._condition:
+            expired = [warm for warm in self.browsers
+                       if warm.state == "idle"
+                       and now - warm.used >= self.idle_timeout]
+            for warm in expired:
+                self.browsers.remove(warm)
+            self.counters["expired"] += len(expired)
+            self._condition.notify_all()
+        for warm in expired:
+            _quit(warm.driver)
+
+    def status(self):
+        now = time.monotonic()
+        with self._condition:
+            busy_seconds = self.busy_seconds + sum(
+                now - warm.used for warm in self.browsers
+                if warm.state == "busy")
+            uptime = now - self.started
+            return {
+                "max_size": self.max_size,
+                "idle_timeout": self.idle_timeout,
+                "max_uses": self.max_uses,
+                "uptime": round(uptime, 1),
+                "utilisation": round(
+                    busy_seconds / (max(uptime, 1) * self.max_size), 3),
+                "counters": dict(self.counters),
+                "browsers": [{
+                    "id": warm.id,
+                    "browser": warm.name,
+                    "state": warm.state,
+                    "uses": warm.uses,
+                    "age": round(now - warm.started, 1),
+                    "idle": round(now - warm.used, 1)
+                    if warm.state == "idle" else 0.0,
+                } for warm in self.browsers],
+            }
+
+    def close(self):
+        with self._condition:
+            browsers, self.browsers = self.browsers, []
+        for warm in browsers:
+            _quit(warm.driver)
+
+    def _take(self, key):
+        for warm in self.browsers:
+            if warm.state == "idle" and warm.key == key:
+                self._lease(warm)
+                return warm
+        return None
+
+    def _launch(self, warm, browser, profile):
+        try:
+            warm.driver = self.launcher(browser, profile)
+        except BaseException:
+            with self._condition:
+                self.browsers.remove(warm)
+                self._condition.notify_all()
+            raise
+        with self._condition:
+            self.counters["launched"] += 1
+
+    def _lease(self, warm):
+        self.counters["leases"] += 1
+        warm.state = "busy"
+        warm.uses += 1
+        warm.used = time.monotonic()
+
+    def _oldest_idle(self):
+        idle = [warm for warm in self.browsers if warm.state == "idle"]
+        return min(idle, key=lambda warm: warm.used, default=None)
+
+
+def _reset(driver):
+    from browser_pool import reset_browser_state
+
+    try:
+        reset_browser_state(driver)
+        return True
+    except Exception:
+        return False
+
+
+def _quit(driver):
+    if driver is not None:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+def launcher(manifest_path):
+    """Запуск headless-браузера со стандартными опциями проекта."""
+    from browsers import launch_browser
+    from driver_cache import DriverManifest
+    from resource_blocking import ResourceBlocker
+
+    manifest = DriverManifest(manifest_path)
+
+    def launch(browser, profile):
+        return launch_browser(browser, True, manifest,
+                              ResourceBlocker.from_options(**profile))
+
+    return launch
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Одна команда на соединение: JSON-строка запроса и ответа.
+
+    Для acquire соединение держится, пока клиент не пришлет release или
+    discard; обрыв соединения равносилен release.
+    """
+
+    def handle(self):
+        pool = self.server.pool
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        command = request.get("command")
+        if command == "status":
+            self._send(pool.status())
+        elif command == "stop":
+            self._send({"ok": True})
+            threading.Thread(target=self.server.shutdown).start()
+        elif command == "acquire":
+            self._acquire(pool, request)
+        else:
+            self._send({"error": f"неизвестная команда {command}"})
+
+    def _acquire(self, pool, request):
+        try:
+            warm = pool.acquire(request["browser"], request["profile"],
+                                request.get("wait", DEFAULT_WAIT))
+        except Exception as e:
+            self._send({"error": f"{type(e).__name__}: {e}"})
+            return
+        if warm is None:
+            self._send({"lease": None})
+            return
+        try:
+            self._send({"lease": warm.lease()})
+            line = self.rfile.readline()
+        except OSError:
+            line = b""
+        discard = bool(line) and json.loads(line).get("command") == "discard"
+        pool.release(warm, discard=discard)
+
+    def _send(self, message):
+        self.wfile.write(json.dumps(message).encode() + b"\n")
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class Lease:
+    """Браузер, выданный демоном на время теста."""
+
+    def __init__(self, connection, info):
+        self.connection = connection
+        self.info = info
+        self.driver = None
+
+    def release(self):
+        self._finish("release")
+
+    def discard(self):
+        """Возврат без повторного использования: браузер закроется."""
+        self._finish("discard")
+
+    def _finish(self, command):
+        if self.driver is not None:
+            self.driver.quit()
+        try:
+            self.connection.sendall(
+                json.dumps({"command": command}).encode() + b"\n")
+        except OSError:
+            pass
+        finally:
+            self.connection.close()
+
+
+class DaemonClient:
+    """Клиент демона; OSError - демон не запущен."""
+
+    def __init__(self, path=None, timeout=10):
+        self.path = path or default_socket()
+        self.timeout = timeout
+
+    def lease(self, browser, profile, wait=DEFAULT_WAIT):
+        """Lease или None, если свободного браузера не дождались."""
+        # Ответ может задержаться на ожидание и запуск браузера
+        connection = self._connect(self.timeout + wait + 60)
+        try:
+            reply = self._call(connection, {
+                "command": "acquire", "browser": browser,
+                "profile": profile, "wait": wait})
+        except BaseException:
+            connection.close()
+            raise
+        if reply.get("lease") is None:
+            connection.close()
+            return None
+        connection.settimeout(None)
+        return Lease(connection, reply["lease"])
+
+    def status(self):
+        return self._request({"command": "status"})
+
+    def stop(self):
+        return self._request({"command": "stop"})
+
+    def _request(self, message):
+        with self._connect(self.timeout) as connection:
+            return self._call(connection, message)
+
+    def _connect(self, timeout):
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(timeout)
+        try:
+            connection.connect(self.path)
+        except OSError:
+            connection.close()
+            raise
+        return connection
+
+    @staticmethod
+    def _call(connection, message):
+        connection.sendall(json.dumps(message).encode() + b"\n")
+        line = connection.makefile("rb").readline()
+        if not line:
+            raise DaemonError("демон закрыл соединение")
+        reply = json.loads(line)
+        if "error" in reply:
+            raise DaemonError(reply["error"])
+        return reply
+
+
+def print_status(status, path):
+    browsers = status["browsers"]
+    states = Counter(browser["state"] for browser in browsers)
+    counters = Counter(status["counters"])
+    leases = counters["leases"]
+    print(f"Демон {path}: работает {status['uptime']:.0f} с")
+    print(f"Браузеров {len(browsers)} из {status['max_size']}: "
+          f"занято {states['busy']}, свободно {states['idle']}, "
+          f"запускается {states['starting']}, "
+          f"очищается {states['resetting']}")
+    print(f"Загрузка пула: {status['utilisation']:.0%}; "
+          f"выдано {leases}, из них теплых {counters['reused']}"
+          + (f" ({counters['reused'] / leases:.0%})" if leases else "")
+          + f"; не дождались {counters['timeouts']}")
+    print(f"Запущено {counters['launched']}, закрыто по простою "
+          f"{counters['expired']} (>{status['idle_timeout']:.0f} с), "
+          f"вытеснено {counters['evicted']}")
+    if not browsers:
+        return
+    print(f"{'id':>4}  {'браузер':<9}{'состояние':<11}{'тестов':>7}"
+          f"{'простой, с':>12}{'возраст, с':>12}")
+    for browser in browsers:
+        print(f"{browser['id']:>4}  {browser['browser']:<9}"
+              f"{browser['state']:<11}{browser['uses']:>7}"
+              f"{browser['idle']:>12.0f}{browser['age']:>12.0f}")
+
+
+def serve(args):
+    client = DaemonClient(args.socket)
+    try:
+        client.status()
+        raise SystemExit(f"Демон уже запущен: {args.socket}")
+    except OSError:
+        # Сокет от завершившегося демона
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+    pool = WarmPool(launcher(args.manifest), max_size=args.max_size,
+                    idle_timeout=args.idle_timeout, max_uses=args.max_uses)
+    umask = os.umask(0o077)
+    try:
+        server = _Server(args.socket, _Handler)
+    finally:
+        os.umask(umask)
+    server.pool = pool
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    stop = threading.Event()
+    evictor = threading.Thread(
+        target=_evict_idle, args=(pool, stop), daemon=True)
+    evictor.start()
+    threading.Thread(
+        target=_warm_up, args=(pool, args.warm), daemon=True).start()
+    print(f"Демон браузеров слушает {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        os.unlink(args.socket)
+        pool.close()
+
+
+def _evict_idle(pool, stop):
+    while not stop.wait(min(max(pool.idle_timeout / 4, 1), 30)):
+        pool.evict_idle()
+
+
+def _warm_up(pool, specs):
+    """Запуск браузеров заранее, --warm chrome:2."""
+    for spec in specs:
+        browser, _, number = spec.partition(":")
+        for _ in range(int(number or 1)):
+            try:
+                if not pool.prelaunch(browser, DEFAULT_PROFILE):
+                    return
+            except Exception as e:
+                print(f"Не удалось запустить {browser}: {e}")
+                break
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Демон «теплых» браузеров для UI тестов")
+    parser.add_argument(
+        "command", choices=["start", "status", "stop"],
+        help="start - запустить демон, status - загрузка пула, "
+             "stop - остановить демон и закрыть браузеры")
+    parser.add_argument(
+        "--socket", default=None,
+        help="Путь к Unix-сокету демона (по умолчанию во временном "
+             "каталоге)")
+    parser.add_argument(
+        "--max-size", type=int, default=4,
+        help="Максимум одновременно запущенных браузеров")
+    parser.add_argument(
+        "--idle-timeout", type=float, default=600,
+        help="Через сколько секунд простоя закрывать браузер")
+    parser.add_argument(
+        "--max-uses", type=int, default=20,
+        help="Через сколько тестов пересоздавать браузер")
+    parser.add_argument(
+        "--warm", action="append", default=[], metavar="BROWSER[:N]",
+        help="Запустить браузеры заранее, например chrome:2")
+    parser.add_argument(
+        "--manifest", default=str(DEFAULT_MANIFEST),
+        help="Манифест путей к драйверам браузеров")
+    parser.add_argument(
+        "--json", action="store_true",
+        help="status в формате JSON")
+    args = parser.parse_args(argv)
+    args.socket = args.socket or default_socket()
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "start":
+        if not hasattr(socket, "AF_UNIX"):
+            raise SystemExit("Демону нужны Unix-сокеты")
+        serve(args)
+        return
+    client = DaemonClient(args.socket)
+    try:
+        if args.command == "stop":
+            client.stop()
+            print("Демон остановлен")
+        elif args.json:
+            print(json.dumps(client.status(), indent=2))
+        else:
+            print_status(client.status(), args.socket)
+    except OSError:
+        raise SystemExit(f"Демон не запущен: {args.socket}")
+
+
+if __name__ == "__main__":
+    main()
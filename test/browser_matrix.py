@@ -0,0 +1,69 @@
+import pytest
+
+BROWSERS = ("chrome", "firefox", "edge")
+
+
+def parse_browsers(value):
+    """Список браузеров из --browser=chrome,firefox,edge без повторов."""
+    names = []
+    for name in value.split(","):
+        name = name.strip().lower()
+        if name and name not in names:
+            names.append(name)
+    unknown = [name for name in names if name not in BROWSERS]
+    if unknown or not names:
+        raise pytest.UsageError(
+            f"--browser: неизвестные браузеры {unknown}; "
+            f"допустимы {', '.join(BROWSERS)} через запятую")
+    return names
+
+
+class BrowserMatrixReport:
+    """Плагин pytest: итоги и время тестов по браузерам матрицы.
+
+    Браузер теста берется из user_properties отчетов (ui_plugin добавляет
+    его во всех фазах), поэтому тест, браузер которого не запустился,
+    попадает в строку своего браузера как skipped.
+    """
+
+    def __init__(self, browsers):
+        self.browsers = browsers
+        self.tests = {}
+
+    def pytest_runtest_logreport(self, report):
+        browser = dict(report.user_properties).get("browser")
+        test = self.tests.get(report.nodeid)
+        if test is None:
+            if browser is None:
+                return
+            test = self.tests[report.nodeid] = {
+                "browser": browser, "seconds": 0.0, "outcome": "passed"}
+        test["seconds"] += report.duration
+        if report.when == "call" or not report.passed:
+            if test["outcome"] == "passed":
+                test["outcome"] = report.outcome
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.tests:
+            return
+        terminalreporter.write_sep("-", "Матрица браузеров")
+        terminalreporter.write_line(
+            f"{'Браузер':<10}{'тестов':>8}{'passed':>8}{'failed':>8}"
+            f"{'skipped':>9}{'всего, с':>10}{'среднее':>9}{'макс.':>8}")
+        for browser in self.browsers:
+            tests = [test for test in self.tests.values()
+                     if test["browser"] == browser]
+            if not tests:
+                # Браузер из --browser без единого отчета (отобраны -k)
+                terminalreporter.write_line(f"{browser:<10}{0:>8}")
+                continue
+            seconds = [test["seconds"] for test in tests]
+            outcomes = [test["outcome"] for test in tests]
+            terminalreporter.write_line(
+                f"{browser:<10}{len(tests):>8}"
+                f"{outcomes.count('passed'):>8}"
+                f"{outcomes.count('failed'):>8}"
+                f"{outcomes.count('skipped'):>9}"
+                f"{sum(seconds):>10.1f}"
+                f"{sum(seconds) / len(seconds):>9.1f}"
+                f"{max(seconds):>8.1f}")
@@ -0,0 +1,76 @@
+from resource_blocking import supports_cdp
+
+
+class BrowserPool:
+    """Один «теплый» браузер на процесс (xdist-воркер).
+
+    Между тестами браузер очищается: cookies, local/session storage,
+    лишние окна, пустая страница. Перед выдачей проверяется, что браузер
+    жив; после max_uses тестов или сбоя он пересоздается.
+    """
+
+    def __init__(self, factory, max_uses=20):
+        self.factory = factory
+        self.max_uses = max_uses
+        self._driver = None
+        self._uses = 0
+
+    def acquire(self):
+        """Выдача готового к тесту браузера."""
+        if self._driver is not None and (
+                self._uses >= self.max_uses or not self._healthy()):
+            self._discard()
+        if self._driver is None:
+            self._driver = self.factory()
+            self._uses = 0
+        self._uses += 1
+        return self._driver
+
+    def release(self, driver):
+        """Возврат браузера в пул с очисткой состояния."""
+        if driver is not self._driver:
+            return
+        try:
+            reset_browser_state(driver)
+        except Exception:
+            self._discard()
+
+    def close(self):
+        """Закрытие браузера в конце сессии."""
+        self._discard()
+
+    def _healthy(self):
+        try:
+            self._driver.current_window_handle
+            return True
+        except Exception:
+            return False
+
+    def _discard(self):
+        driver, self._driver = self._driver, None
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+def reset_browser_state(driver):
+    """Очистка состояния браузера между тестами."""
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+    # Storage привязан к origin, поэтому чистим его до ухода со страницы
+    try:
+        driver.execute_script(
+            "window.localStorage.clear(); window.sessionStorage.clear();")
+    except Exception:
+        pass
+    driver.delete_all_cookies()
+    if supports_cdp(driver):
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+
+    driver.get("about:blank")
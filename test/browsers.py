@@ -0,0 +1,209 @@
+import pytest
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.webdriver.edge.options import Options as EdgeOptions
+from selenium.webdriver.remote.command import Command
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.firefox import GeckoDriverManager
+from webdriver_manager.microsoft import EdgeChromiumDriverManager
+
+from driver_cache import DriverManifest
+from profiler import CommandProfiler
+from resource_blocking import ResourceBlocker
+
+
+def create_driver(config, browser_name):
+    """Запуск браузера browser_name (chrome, firefox или edge)."""
+    blocker = ResourceBlocker.from_config(config)
+    try:
+        driver = launch_browser(
+            browser_name, config.getoption("--headless"),
+            driver_manifest(config), blocker)
+    except Exception as e:
+        pytest.skip(f"Не удалось инициализировать {browser_name}: {e}")
+    return _prepare(config, driver, blocker)
+
+
+def attach_driver(config, lease):
+    """Драйвер к браузеру, выданному демоном browser_daemon."""
+    blocker = ResourceBlocker.from_config(config)
+    return _prepare(config, AttachedDriver(lease), blocker)
+
+
+def driver_manifest(config):
+    """Манифест драйверов в кэше pytest; None, если кэш отключен."""
+    if getattr(config, "cache", None) is None:
+        return None
+    return DriverManifest(config.cache.mkdir("webdriver") / "manifest.json")
+
+
+def launch_profile(config):
+    """Настройки запуска браузера, от которых зависит его повторное
+    использование: браузеры демона выдаются только с теми же настройками.
+    """
+    return {
+        "block_resources": config.getoption("--block-resources"),
+        "block_url": config.getoption("--block-url") or [],
+        "page_load_strategy": config.getoption("--page-load-strategy"),
+    }
+
+
+def launch_browser(browser_name, headless, manifest, blocker):
+    """Запуск браузера со стандартными опциями и таймаутами проекта."""
+    try:
+        if browser_name.lower() == "chrome":
+            driver = _init_chrome_driver(headless, manifest, blocker)
+        elif browser_name.lower() == "firefox":
+            driver = _init_firefox_driver(headless, manifest, blocker)
+        elif browser_name.lower() == "edge":
+            driver = _init_edge_driver(headless, manifest, blocker)
+        else:
+            raise ValueError(f"Неподдерживаемый браузер: {browser_name}")
+
+    except Exception:
+        # Если автоматическая установка не сработала, пробуем системный драйвер
+        if browser_name.lower() != "chrome":
+            raise
+        options = Options()
+        if headless:
+            options.add_argument("--headless")
+        service = Service()
+        driver = webdriver.Chrome(service=service, options=options)
+
+    try:
+        # Устанавливаем таймауты
+        driver.implicitly_wait(15)
+        driver.set_page_load_timeout(45)
+
+        blocker.attach(driver)
+    except Exception:
+        driver.quit()
+        raise
+    return driver
+
+
+def _prepare(config, driver, blocker):
+    """Общая настройка драйвера для тестов."""
+    # Сохраняем URL для использования в тестах
+    driver.base_url = config.getoption("--url")
+    driver.resource_blocker = blocker
+
+    if config.getoption("--webdriver-profile"):
+        CommandProfiler().install(driver)
+
+    if config.getoption("--dom-snapshots") == "record":
+        from dom_snapshots import DomRecorder, SnapshotStore
+
+        driver.dom_recorder = DomRecorder(
+            SnapshotStore(config.getoption("--dom-snapshot-dir")))
+
+    return driver
+
+
+class AttachedDriver(webdriver.Remote):
+    """Подключение к уже открытой сессии браузера демона.
+
+    Новая сессия не создается: идентификатор и capabilities берутся из
+    выдачи демона. quit() только закрывает соединение, сам браузер
+    остается у демона.
+    """
+
+    OPTIONS = {
+        "chrome": Options,
+        "firefox": FirefoxOptions,
+        "edge": EdgeOptions,
+    }
+
+    def __init__(self, lease):
+        self._lease = lease
+        super().__init__(
+            command_executor=lease["executor_url"],
+            options=self.OPTIONS[lease["browser"]]())
+
+    def start_session(self, capabilities):
+        self.session_id = self._lease["session_id"]
+        self.caps = self._lease["capabilities"]
+
+    def get_log(self, log_type):
+        return self.execute(Command.GET_LOG, {"type": log_type})["value"]
+
+    def quit(self):
+        self.command_executor.close()
+
+
+def _driver_path(manifest, browser, manager_class):
+    # Без манифеста версию драйвера определяет сам webdriver_manager
+    if manifest is None:
+        return manager_class().install()
+    return manifest.resolve(browser, manager_class)
+
+
+def _init_chrome_driver(headless, manifest, blocker):
+    """Инициализация Chrome драйвера."""
+    options = Options()
+
+    # Базовые опции
+    options.add_argument("--start-maximized")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("useAutomationExtension", False)
+
+    # Опции для стабильности
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-notifications")
+    options.add_argument("--disable-popup-blocking")
+    options.add_argument("--disable-web-security")
+    options.add_argument("--allow-running-insecure-content")
+    options.add_argument("--ignore-certificate-errors")
+
+    # Улучшенные настройки для производительности
+    options.add_argument("--disable-software-rasterizer")
+    options.add_argument("--disable-features=VizDisplayCompositor")
+    options.add_argument("--disable-background-timer-throttling")
+    options.add_argument("--disable-renderer-backgrounding")
+
+    if headless:
+        options.add_argument("--headless=new")
+
+    blocker.apply_options(options, "chrome")
+
+    # Драйвер скачивается один раз на версию браузера, далее - из манифеста
+    service = Service(_driver_path(manifest, "chrome", ChromeDriverManager))
+    driver = webdriver.Chrome(service=service, options=options)
+
+    # Дополнительные настройки драйвера
+    driver.set_script_timeout(30)
+
+    return driver
+
+
+def _init_firefox_driver(headless, manifest, blocker):
+    """Инициализация Firefox драйвера."""
+    options = FirefoxOptions()
+
+    if headless:
+        options.add_argument("--headless")
+
+    blocker.apply_options(options, "firefox")
+
+    service = Service(_driver_path(manifest, "firefox", GeckoDriverManager))
+    return webdriver.Firefox(service=service, options=options)
+
+
+def _init_edge_driver(headless, manifest, blocker):
+    """Инициализация Edge драйвера."""
+    options = EdgeOptions()
+
+    if headless:
+        options.add_argument("--headless")
+
+    blocker.apply_options(options, "edge")
+
+    service = Service(
+        _driver_path(manifest, "edge", EdgeChromiumDriverManager))
+    return webdriver.Edge(service=service, options=options)
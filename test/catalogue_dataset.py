@@ -0,0 +1,144 @@
+import csv
+import hashlib
+import json
+import zlib
+from collections import OrderedDict, deque, namedtuple
+from pathlib import Path
+
+from schemas import FILM
+
+
+# Строка набора: смещения в байтах (начало и конец строки файла), номер
+# строки данных, ID фильма и ожидаемые поля ответа API
+DatasetRow = namedtuple("DatasetRow", "offset end row id expected")
+
+ID_FIELD = "kinopoiskId"
+
+
+class FilmDataset:
+    """Потоковое чтение набора фильмов из CSV или JSONL.
+
+    Файл читается построчно, поэтому ни время сбора тестов, ни память
+    не зависят от размера набора. Строки отбираются по номеру: выборка
+    (sample - доля строк, детерминированно от seed) и шард (shard из
+    shards, по одному на xdist-воркер). Позиция последней обработанной
+    подряд строки (position) сохраняется, чтобы через resume продолжить
+    прерванный прогон с того же байта файла.
+
+    CSV: первая строка - заголовок со столбцом kinopoiskId, значения
+    без переводов строк. JSONL: по объекту на строку. Остальные поля -
+    ожидаемые значения в ответе /films/{id}; пустые не проверяются.
+    """
+
+    def __init__(self, path, sample=1.0, seed=0, shard=0, shards=1):
+        self.path = Path(path)
+        self.sample = sample
+        self.seed = seed
+        self.shard = shard
+        self.shards = shards
+        self.processed = 0
+        self._pending = OrderedDict()
+        self._done = set()
+        self._position = {"offset": 0, "row": 0}
+
+    @property
+    def key(self):
+        """Ключ контрольной точки: файл и шард."""
+        digest = hashlib.sha1(str(self.path.resolve()).encode()).hexdigest()
+        return f"datasets/{digest[:12]}/{self.shard}-of-{self.shards}"
+
+    def resume(self, position):
+        """Продолжение с сохраненной позиции {"offset": ..., "row": ...}."""
+        if position:
+            self._position = dict(position)
+
+    @property
+    def position(self):
+        return dict(self._position)
+
+    def rows(self):
+        """Строки шарда с учетом выборки, начиная с текущей позиции."""
+        with open(self.path, "rb") as data:
+            header = None
+            if self.path.suffix.lower() == ".csv":
+                # utf-8-sig: CSV из Excel начинается с BOM
+                line = data.readline().decode("utf-8-sig")
+                header = next(csv.reader([line]))
+            offset = max(self._position["offset"], data.tell())
+            data.seek(offset)
+            row = self._position["row"]
+            for line in data:
+                end = offset + len(line)
+                if line.strip() and self._selected(row):
+                    record = self._parse(line.decode("utf-8-sig"), header)
+                    item = DatasetRow(offset, end, row,
+                                      int(record.pop(ID_FIELD)), record)
+                    self._pending[item.offset] = item
+                    yield item
+                if line.strip():
+                    row += 1
+                offset = end
+
+    def done(self, item):
+        """Отметка строки как обработанной; сдвигает контрольную точку."""
+        self.processed += 1
+        self._done.add(item.offset)
+        while self._pending:
+            offset, first = next(iter(self._pending.items()))
+            if offset not in self._done:
+                break
+            self._pending.popitem(last=False)
+            self._done.discard(offset)
+            self._position = {"offset": first.end, "row": first.row + 1}
+
+    def fetch(self, async_client, endpoint_template="/films/{}"):
+        """Пары (строка, BatchResult) по мере ответов API.
+
+        Строки в полете связываются с ответами по ID; одновременно в
+        памяти держится не больше concurrency строк.
+        """
+        in_flight = {}
+
+        def ids():
+            for item in self.rows():
+                in_flight.setdefault(item.id, deque()).append(item)
+                yield item.id
+
+        for result in async_client.iter_many(endpoint_template, ids()):
+            queue = in_flight[result.id]
+            item = queue.popleft()
+            if not queue:
+                del in_flight[result.id]
+            yield item, result
+
+    def _selected(self, row):
+        if row % self.shards != self.shard:
+            return False
+        if self.sample >= 1:
+            return True
+        value = zlib.crc32(f"{self.seed}:{row}".encode())
+        return value < self.sample * 2 ** 32
+
+    @staticmethod
+    def _parse(line, header):
+        if header is None:
+            return json.loads(line)
+        values = next(csv.reader([line]))
+        return {name: value for name, value in zip(header, values) if value}
+
+
+def check_film(item, result):
+    """Несоответствие ответа API строке набора или None."""
+    if result.error is not None:
+        return f"{item.id}: {result.error}"
+    if result.response.status_code != 200:
+        return f"{item.id}: HTTP {result.response.status_code}"
+    data = result.response.json()
+    errors = FILM.errors(data)
+    if errors:
+        return f"{item.id}: {errors[0]}"
+    for field, expected in item.expected.items():
+        if str(data.get(field)) != str(expected):
+            return (f"{item.id}: {field} = {data.get(field)!r}, "
+                    f"ожидалось {expected!r}")
+    return None
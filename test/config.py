@@ -12,3 +12,11 @@ class Config:
     TEST_SERIES_ID = 5512084  # Сериал для теста сезонов
     TEST_FILM_WITH_AWARDS_ID = 258687  # Интерстеллар (есть награды)
     TEST_FILM_WITH_SIMILARS_ID = 258687  # Интерстеллар (есть похожие фильмы)
+
+    # Каталог для пакетных проверок
+    CATALOGUE_FILM_IDS = [
+        TEST_FILM_ID,
+        TEST_SERIES_ID,
+        TEST_FILM_WITH_AWARDS_ID,
+        325,  # Крестный отец
+    ]
@@ -0,0 +1,306 @@
+"""Снимки DOM из реального браузера и офлайн-проверка локаторов.
+
+В режиме record после каждого успешного ожидания WaitEngine текущая
+страница сохраняется как HTML. Скрытые элементы (display: none, нулевой
+размер, visibility: hidden, opacity: 0) помечаются атрибутом, потому что
+вычисленные стили без браузера недоступны. В режиме replay фикстура
+driver отдает OfflineDriver: те же page-объекты и тесты выполняются над
+сохраненными снимками, а CSS и XPath вычисляет lxml.
+"""
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pytest
+from lxml import etree, html
+from lxml.cssselect import CSSSelector
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    WebDriverException,
+)
+
+from pages import SNAPSHOT_SCRIPT, js_locator
+from rate_limit import file_lock
+from waits import PAGE_SIGNATURE_SCRIPT
+
+HIDDEN_ATTRIBUTE = "data-offline-hidden"
+
+# Помечает корни скрытых поддеревьев, сериализует DOM и снимает пометки
+CAPTURE_SCRIPT = """
+const attribute = arguments[0];
+const hidden = [];
+const walk = (parent) => {
+    for (const el of parent.children) {
+        const style = window.getComputedStyle(el);
+        if (style.display === "contents") {
+            walk(el);
+        } else if (style.display === "none"
+                || style.visibility === "hidden"
+                || parseFloat(style.opacity || "1") === 0
+                || el.getClientRects().length === 0) {
+            el.setAttribute(attribute, "");
+            hidden.push(el);
+        } else {
+            walk(el);
+        }
+    }
+};
+if (document.body) {
+    walk(document.body);
+}
+const result = {
+    url: location.href,
+    title: document.title,
+    html: "<!DOCTYPE html>" + document.documentElement.outerHTML
+};
+hidden.forEach((el) => el.removeAttribute(attribute));
+return result;
+"""
+
+# Содержимое этих тегов не входит в видимый текст страницы
+NON_TEXT_TAGS = {"script", "style", "noscript", "template", "head"}
+
+
+def snapshot_key(url):
+    """Ключ снимка: путь и запрос URL без хоста."""
+    parts = urlsplit(url)
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+class SnapshotStore:
+    """Каталог с HTML-снимками и индексом {ключ URL: файл и заголовок}."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.index_path = self.directory / "index.json"
+
+    def save(self, url, title, page_html):
+        key = snapshot_key(url)
+        name = hashlib.sha1(key.encode()).hexdigest()[:16] + ".html"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._write(self.directory / name, page_html)
+        with file_lock(str(self.index_path) + ".lock"):
+            index = self.index()
+            index[key] = {"file": name, "url": url, "title": title}
+            self._write(self.index_path, json.dumps(
+                index, indent=1, ensure_ascii=False, sort_keys=True))
+
+    def index(self):
+        try:
+            return json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def load(self, url):
+        """OfflineDocument для url или None, если снимка нет."""
+        entry = self.index().get(snapshot_key(url))
+        if entry is None:
+            return None
+        return _parse(str(self.directory / entry["file"]), entry["url"])
+
+    @staticmethod
+    def _write(path, text):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as output:
+            output.write(text)
+        os.replace(tmp_path, path)
+
+
+class DomRecorder:
+    """Запись снимков страниц во время прогона с реальным браузером."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def capture(self, driver):
+        try:
+            page = driver.execute_script(CAPTURE_SCRIPT, HIDDEN_ATTRIBUTE)
+        except Exception as e:
+            print(f"Не удалось сохранить снимок DOM: {e}")
+            return
+        self.store.save(page["url"], page["title"], page["html"])
+
+
+_PARSER = html.HTMLParser(encoding="utf-8")
+
+
+@lru_cache(maxsize=32)
+def _parse(path, url):
+    # Один разбор файла на процесс: тесты одной страницы его разделяют
+    with open(path, "rb") as source:
+        return OfflineDocument(
+            html.document_fromstring(source.read(), parser=_PARSER), url)
+
+
+@lru_cache(maxsize=256)
+def _compile(how, what):
+    if how == "xpath":
+        return etree.XPath(what)
+    return CSSSelector(what, translator="html")
+
+
+class OfflineDocument:
+    """Разобранный снимок страницы с поиском по CSS и XPath."""
+
+    def __init__(self, root, url):
+        self.root = root
+        self.url = url
+        titles = root.xpath("//title")
+        self.title = titles[0].text_content().strip() if titles else ""
+        self._body = root.find("body")
+
+    def find_all(self, how, what):
+        return [node for node in _compile(how, what)(self.root)
+                if isinstance(node, etree.ElementBase)]
+
+    def find(self, how, what):
+        nodes = self.find_all(how, what)
+        return nodes[0] if nodes else None
+
+    def visible(self, node):
+        if self._body is None:
+            return False
+        for parent in node.iterancestors():
+            if parent is self._body:
+                break
+            if _hidden(parent):
+                return False
+        else:
+            return False
+        return not _hidden(node)
+
+    @staticmethod
+    def text(node):
+        """Приближение innerText: текст без скрытых и служебных узлов."""
+        parts = []
+
+        def walk(element):
+            if not isinstance(element.tag, str) or _hidden(element):
+                return
+            parts.append(element.text or "")
+            for child in element:
+                walk(child)
+                parts.append(child.tail or "")
+
+        walk(node)
+        return " ".join("".join(parts).split())
+
+    def page(self):
+        """Тот же результат, что PAGE_SIGNATURE_SCRIPT в браузере."""
+        text = self.text(self._body) if self._body is not None else ""
+        return {"url": self.url, "title": self.title, "text": text[:3000]}
+
+    def snapshot(self, locators):
+        """Тот же результат, что SNAPSHOT_SCRIPT в браузере."""
+        elements = {}
+        for name, (how, what) in locators.items():
+            try:
+                node = self.find(how, what)
+            except (etree.XPathError, ValueError, SyntaxError):
+                node = None
+            elements[name] = {
+                "found": node is not None,
+                "visible": node is not None and self.visible(node),
+                "text": self.text(node) if node is not None else "",
+            }
+        return {**self.page(), "elements": elements}
+
+
+def _hidden(node):
+    return (HIDDEN_ATTRIBUTE in node.attrib or "hidden" in node.attrib
+            or node.tag in NON_TEXT_TAGS)
+
+
+class OfflineElement:
+    """Элемент снимка с интерфейсом WebElement, нужным page-объектам."""
+
+    def __init__(self, document, node):
+        self.document = document
+        self.node = node
+
+    @property
+    def tag_name(self):
+        return self.node.tag
+
+    @property
+    def text(self):
+        return self.document.text(self.node)
+
+    def is_displayed(self):
+        return self.document.visible(self.node)
+
+    def is_enabled(self):
+        return "disabled" not in self.node.attrib
+
+    def get_attribute(self, name):
+        return self.node.get(name)
+
+    def click(self):
+        """Клик офлайн ничего не меняет: снимок статичен."""
+
+    def submit(self):
+        pytest.skip("Отправка формы недоступна без браузера")
+
+
+class OfflineDriver:
+    """Драйвер без браузера поверх снимков DOM (--dom-snapshots=replay)."""
+
+    # Снимок не меняется, поэтому ожидания не повторяют опрос
+    static = True
+
+    def __init__(self, store, base_url):
+        self.store = store
+        self.base_url = base_url
+        self.document = None
+
+    @property
+    def current_url(self):
+        return self.document.url if self.document else "about:blank"
+
+    @property
+    def title(self):
+        return self.document.title if self.document else ""
+
+    def get(self, url):
+        self.document = self.store.load(url)
+        if self.document is None:
+            pytest.skip(f"Нет снимка DOM для {snapshot_key(url)}; "
+                        "запишите его с --dom-snapshots=record")
+
+    def refresh(self):
+        pass
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def execute_script(self, script, *args):
+        if script == SNAPSHOT_SCRIPT:
+            return self.document.snapshot(args[0])
+        if script == PAGE_SIGNATURE_SCRIPT:
+            return self.document.page()
+        pytest.skip("JavaScript недоступен без браузера")
+
+    def execute(self, command, params=None):
+        # Сюда приходят ActionChains и прочие команды WebDriver
+        pytest.skip(f"Команда {command} недоступна без браузера")
+
+    def find_elements(self, by, value):
+        how, what = js_locator((by, value))
+        return [OfflineElement(self.document, node)
+                for node in self.document.find_all(how, what)]
+
+    def find_element(self, by, value):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"{by}: {value}")
+        return elements[0]
+
+    def get_screenshot_as_png(self):
+        # ScreenshotService пропускает скриншот с сообщением в выводе теста
+        raise WebDriverException("Скриншоты недоступны без браузера")
+
+    def quit(self):
+        pass
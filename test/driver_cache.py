@@ -0,0 +1,85 @@
+import json
+import os
+
+from rate_limit import file_lock
+
+
+# Тип браузера для определения версии средствами webdriver_manager
+BROWSER_TYPES = {
+    "chrome": "google-chrome",
+    "firefox": "firefox",
+    "edge": "edge",
+}
+
+# Пути и версии браузеров, уже найденные в этом процессе
+_resolved = {}
+_versions = {}
+
+
+def browser_version(browser):
+    """Версия установленного браузера (без обращения к сети) или None.
+
+    Определяется запуском браузера с --version, поэтому один раз на
+    процесс.
+    """
+    if browser not in _versions:
+        from webdriver_manager.core.os_manager import OperationSystemManager
+
+        try:
+            version = OperationSystemManager().get_browser_version_from_os(
+                BROWSER_TYPES[browser])
+        except Exception:
+            version = None
+        _versions[browser] = version or None
+    return _versions[browser]
+
+
+class DriverManifest:
+    """Локальный манифест путей к драйверам по версии браузера.
+
+    Драйвер скачивается webdriver_manager'ом один раз для версии браузера,
+    после чего все запуски и xdist-воркеры берут путь из манифеста без
+    обращения к сети.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.lock_path = self.path + ".lock"
+
+    def resolve(self, browser, manager_class):
+        """Путь к драйверу: из манифеста или через manager_class()."""
+        version = browser_version(browser)
+        key = (self.path, browser, version)
+        if key in _resolved:
+            return _resolved[key]
+        if version is None:
+            # Без версии запись манифеста нельзя сверить с браузером
+            # после обновления, поэтому драйвер подбирает webdriver_manager
+            _resolved[key] = manager_class().install()
+            return _resolved[key]
+
+        # Блокировка держится и на время установки, чтобы воркеры
+        # не скачивали один и тот же драйвер параллельно
+        with file_lock(self.lock_path):
+            manifest = self._read()
+            driver_path = manifest.get(browser, {}).get(version)
+            if not driver_path or not os.path.exists(driver_path):
+                driver_path = manager_class().install()
+                manifest.setdefault(browser, {})[version] = driver_path
+                self._write(manifest)
+
+        _resolved[key] = driver_path
+        return driver_path
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as manifest_file:
+                return json.load(manifest_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, manifest):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,188 @@
+import heapq
+import time
+
+# Оценка для тестов без истории, секунды
+DEFAULT_SECONDS = {True: 20.0, False: 0.5}
+
+# Вес последнего запуска в скользящем среднем длительности
+SMOOTHING = 0.5
+
+
+class DurationHistory:
+    """История длительностей тестов в кэше pytest.
+
+    Для каждого nodeid хранится сглаженная длительность (setup + call +
+    teardown) и браузер теста (None - тест без браузера). Для нового
+    теста без истории браузер берется из параметра [chrome]/[firefox] в
+    nodeid или по другим тестам его модуля.
+    """
+
+    CACHE_KEY = "scheduling/durations"
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.tests = cache.get(self.CACHE_KEY, {})
+        self._module_engines = {}
+        for nodeid, test in self.tests.items():
+            if test["browser"]:
+                module = nodeid.split("::", 1)[0]
+                self._module_engines[module] = test["browser"]
+        self._engines = set(self._module_engines.values())
+
+    def engine(self, nodeid):
+        """Браузер теста или None для теста без браузера."""
+        test = self.tests.get(nodeid)
+        if test is not None:
+            return test["browser"] or None
+        module, _, rest = nodeid.partition("::")
+        if module not in self._module_engines:
+            return None
+        params = rest.partition("[")[2].rstrip("]").split("-")
+        for name in params:
+            if name in self._engines:
+                return name
+        return self._module_engines[module]
+
+    def is_browser(self, nodeid):
+        return self.engine(nodeid) is not None
+
+    def estimate(self, nodeid):
+        test = self.tests.get(nodeid)
+        if test is not None:
+            return test["seconds"]
+        return DEFAULT_SECONDS[self.is_browser(nodeid)]
+
+    def update(self, durations, browsers):
+        """Добавление запуска: {nodeid: секунды}, {nodeid: браузер}."""
+        for nodeid, seconds in durations.items():
+            previous = self.tests.get(nodeid)
+            if previous is not None:
+                seconds = (SMOOTHING * seconds
+                           + (1 - SMOOTHING) * previous["seconds"])
+            self.tests[nodeid] = {
+                "seconds": round(seconds, 4),
+                "browser": browsers.get(nodeid),
+            }
+        self.cache.set(self.CACHE_KEY, self.tests)
+
+
+def pick(pending, engine, engine_of, orphans=()):
+    """Следующий тест для воркера из pending (по убыванию длительности).
+
+    Воркер с браузером engine сначала берет тесты этого браузера, чтобы
+    они шли в уже запущенном экземпляре, затем тесты без браузера.
+    Воркер без браузера (engine=None) берет только тесты без браузера.
+    Тесты браузеров из orphans (без своих воркеров) может взять любой.
+    None - подходящих тестов нет.
+    """
+    fallback = None
+    for test in pending:
+        test_engine = engine_of(test)
+        if test_engine is None:
+            if engine is None:
+                return test
+            if fallback is None:
+                fallback = test
+        elif test_engine == engine or test_engine in orphans:
+            return test
+    return fallback
+
+
+def assign_engines(estimates, engines, workers):
+    """Браузер для каждого воркера (None - только тесты без браузера).
+
+    Каждому браузеру достается хотя бы один воркер, если их хватает,
+    а дальше воркеры делятся по доле браузера в общем времени прогона.
+    """
+    totals = {}
+    for test, seconds in estimates.items():
+        if engines.get(test) is not None:
+            totals[engines[test]] = totals.get(engines[test], 0) + seconds
+    ordered = sorted(totals, key=totals.get, reverse=True)[:workers]
+    total = sum(estimates.values())
+    counts = {
+        engine: max(1, round(totals[engine] / total * workers))
+        for engine in ordered}
+    while sum(counts.values()) > workers:
+        largest = max(counts, key=counts.get)
+        counts[largest] -= 1
+    assignment = [engine for engine in ordered
+                  for _ in range(counts[engine])]
+    return assignment + [None] * (workers - len(assignment))
+
+
+def predict_makespan(estimates, engines, assignment):
+    """Длительность прогона по оценкам при жадном распределении pick."""
+    pending = sorted(estimates, key=estimates.get, reverse=True)
+    orphans = set(engines.values()) - set(assignment)
+    free = [(0.0, worker) for worker in range(len(assignment))]
+    makespan = 0.0
+    while pending and free:
+        started, worker = heapq.heappop(free)
+        test = pick(pending, assignment[worker], engines.get, orphans)
+        if test is None:
+            continue
+        pending.remove(test)
+        finished = started + estimates[test]
+        makespan = max(makespan, finished)
+        heapq.heappush(free, (finished, worker))
+    return makespan
+
+
+class DurationReport:
+    """Плагин pytest: запись длительностей тестов и сводка по воркерам.
+
+    Работает в главном процессе: отчеты xdist-воркеров приходят сюда же,
+    поэтому история пополняется и при параллельном запуске. Пропущенные
+    тесты и браузерные тесты над снимками DOM (--dom-snapshots=replay)
+    историю не меняют: их время не похоже на обычный прогон.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.history = DurationHistory(config.cache)
+        self.offline = config.getoption("--dom-snapshots", "off") == "replay"
+        self.durations = {}
+        self.browsers = {}
+        self.skipped = set()
+        self.workers = {}
+        self.predicted = None
+        self.started = None
+        self.elapsed = None
+
+    def pytest_sessionstart(self, session):
+        self.started = time.perf_counter()
+
+    def pytest_runtest_logreport(self, report):
+        self.durations[report.nodeid] = (
+            self.durations.get(report.nodeid, 0.0) + report.duration)
+        if report.skipped:
+            self.skipped.add(report.nodeid)
+        node = getattr(report, "node", None)
+        if node is not None:
+            worker = node.gateway.id
+            self.workers[worker] = (
+                self.workers.get(worker, 0.0) + report.duration)
+        for name, value in report.user_properties:
+            if name == "browser":
+                self.browsers[report.nodeid] = value
+
+    def pytest_sessionfinish(self, session):
+        if self.started is not None:
+            self.elapsed = time.perf_counter() - self.started
+        durations = {
+            nodeid: seconds for nodeid, seconds in self.durations.items()
+            if nodeid not in self.skipped
+            and not (self.offline and nodeid in self.browsers)}
+        if durations:
+            self.history.update(durations, self.browsers)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.predicted is None or not self.workers:
+            return
+        terminalreporter.write_sep("-", "Распределение по длительности")
+        for worker, busy in sorted(self.workers.items()):
+            terminalreporter.write_line(f"{worker:<8}{busy:>10.1f} с")
+        terminalreporter.write_line(
+            f"Прогноз makespan: {self.predicted:.1f} с, "
+            f"факт (от начала до конца сессии): {self.elapsed:.1f} с")
@@ -0,0 +1,249 @@
+"""Нагрузочный прогон сценариев из test_api.py.
+
+Тесты с единственной фикстурой api_client выполняются как сценарии
+нагрузки: с постоянной частотой запуска (--rps) или постоянным числом
+одновременных пользователей (--concurrency) в течение --duration секунд.
+
+Пример:
+    python test/load_generator.py --rps 20 --duration 60
+    python test/load_generator.py --concurrency 50 --url http://proxy/api/
+"""
+import argparse
+import inspect
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from api_benchmark import LatencyHistogram
+from api_client import APIClient
+from api_plugin import Config
+
+
+def load_scenarios(module_name="test_api", names=None):
+    """Тестовые функции модуля, которым нужен только api_client."""
+    module = __import__(module_name)
+    scenarios = {}
+    for name, function in inspect.getmembers(module, inspect.isfunction):
+        if not name.startswith("test_") or (names and name not in names):
+            continue
+        if list(inspect.signature(function).parameters) == ["api_client"]:
+            scenarios[name] = function
+    return scenarios
+
+
+class LoadStats:
+    """Счетчики нагрузочного прогона: общие и за текущий интервал."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.statuses = Counter()
+        self.failures = Counter()
+        self.scenarios = Counter()
+        self.skipped = 0
+        self.histogram = LatencyHistogram()
+        self._interval = LatencyHistogram()
+        self._interval_started = self.started
+        self._interval_errors = 0
+
+    def response_hook(self, response, *args, **kwargs):
+        """Хук requests: код ответа и время до получения заголовков."""
+        ms = response.elapsed.total_seconds() * 1000
+        with self._lock:
+            self.statuses[response.status_code] += 1
+            self.histogram.record(ms)
+            self._interval.record(ms)
+            if response.status_code >= 400:
+                self._interval_errors += 1
+
+    def scenario_done(self, name, error=None):
+        with self._lock:
+            self.scenarios[name] += 1
+            if error is not None:
+                self.failures[f"{name}: {type(error).__name__}"] += 1
+
+    def interval(self):
+        """Сводка за интервал с прошлого вызова; счетчики интервала
+        обнуляются."""
+        now = time.perf_counter()
+        with self._lock:
+            histogram, errors = self._interval, self._interval_errors
+            seconds = now - self._interval_started
+            self._interval = LatencyHistogram()
+            self._interval_errors = 0
+            self._interval_started = now
+        return {
+            "elapsed": now - self.started,
+            "rps": histogram.count / seconds if seconds else 0.0,
+            "errors": errors,
+            **histogram.summary(),
+        }
+
+
+class LoadGenerator:
+    """Запуск сценариев в пуле потоков поверх одного пула соединений."""
+
+    def __init__(self, client, scenarios, stats, concurrency=20):
+        self.client = client
+        self.scenarios = scenarios
+        self.stats = stats
+        self.concurrency = concurrency
+        self._names = sorted(scenarios)
+        self._stop = threading.Event()
+
+    def run_closed(self, duration):
+        """concurrency пользователей, каждый запускает сценарии подряд."""
+        deadline = time.perf_counter() + duration
+
+        def user():
+            while not self._stop.is_set() and time.perf_counter() < deadline:
+                self._run_one()
+
+        with ThreadPoolExecutor(self.concurrency,
+                                thread_name_prefix="load") as executor:
+            for _ in range(self.concurrency):
+                executor.submit(user)
+
+    def run_open(self, rps, duration):
+        """Запуск сценариев с частотой rps независимо от ответов.
+
+        Если все concurrency потоков заняты, запуск пропускается и
+        учитывается в stats.skipped: очередь не копится, и задержки не
+        скрывают перегрузку.
+        """
+        slots = threading.BoundedSemaphore(self.concurrency)
+
+        def task():
+            try:
+                self._run_one()
+            finally:
+                slots.release()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(self.concurrency,
+                                thread_name_prefix="load") as executor:
+            for tick in range(int(rps * duration)):
+                delay = started + tick / rps - time.perf_counter()
+                if self._stop.wait(max(delay, 0)):
+                    break
+                if slots.acquire(blocking=False):
+                    executor.submit(task)
+                else:
+                    self.stats.skipped += 1
+
+    def stop(self):
+        self._stop.set()
+
+    def _run_one(self):
+        name = random.choice(self._names)
+        try:
+            self.scenarios[name](self.client)
+        except Exception as error:
+            self.stats.scenario_done(name, error)
+        else:
+            self.stats.scenario_done(name)
+
+
+def report_intervals(stats, every, stop):
+    """Печать строки с задержками каждые every секунд до stop."""
+    print(f"{'время, с':>9}{'RPS':>8}{'ошибок':>8}"
+          f"{'p50':>9}{'p95':>9}{'p99':>9}")
+    while not stop.wait(every):
+        row = stats.interval()
+        latencies = "".join(
+            f"{row[name]:>9.1f}" if row[name] is not None else f"{'-':>9}"
+            for name in ("p50", "p95", "p99"))
+        print(f"{row['elapsed']:>9.0f}{row['rps']:>8.1f}"
+              f"{row['errors']:>8}{latencies}")
+
+
+def print_summary(stats):
+    elapsed = time.perf_counter() - stats.started
+    total = sum(stats.statuses.values())
+    print(f"\nЗапросов: {total} за {elapsed:.1f} с "
+          f"({total / elapsed:.1f} в секунду), "
+          f"сценариев: {sum(stats.scenarios.values())}, "
+          f"пропущено запусков: {stats.skipped}")
+    summary = stats.histogram.summary()
+    if summary["count"]:
+        print(f"Задержка, мс: p50 {summary['p50']:.1f}, "
+              f"p95 {summary['p95']:.1f}, p99 {summary['p99']:.1f}")
+    print("Коды ответов:")
+    for status, count in sorted(stats.statuses.items()):
+        print(f"  {status}: {count}")
+    if stats.failures:
+        print("Упавшие сценарии:")
+        for failure, count in stats.failures.most_common():
+            print(f"  {failure}: {count}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Нагрузочный прогон сценариев test_api.py")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument(
+        "--rps", type=float,
+        help="Частота запуска сценариев в секунду (открытая модель)")
+    load.add_argument(
+        "--concurrency", type=int,
+        help="Число одновременных пользователей (закрытая модель)")
+    parser.add_argument(
+        "--duration", type=float, default=60,
+        help="Длительность прогона, секунды")
+    parser.add_argument(
+        "--threads", type=int, default=50,
+        help="Потолок одновременных сценариев при --rps")
+    parser.add_argument(
+        "--interval", type=float, default=10,
+        help="Период вывода промежуточной статистики, секунды")
+    parser.add_argument(
+        "--scenario", action="append",
+        help="Запускать только указанные тесты (можно несколько раз)")
+    parser.add_argument(
+        "--url", default=Config.API_URL,
+        help="Базовый URL API, например адрес прокси")
+    parser.add_argument(
+        "--timeout", type=float, default=30,
+        help="Таймаут запроса, секунды")
+    args = parser.parse_args(argv)
+    if args.rps is None and args.concurrency is None:
+        args.concurrency = 10
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    scenarios = load_scenarios(names=args.scenario)
+    if not scenarios:
+        raise SystemExit("Не найдено ни одного сценария")
+
+    concurrency = args.concurrency or args.threads
+    stats = LoadStats()
+    client = APIClient(args.url, Config.HEADERS, pool_size=concurrency,
+                       timeout=args.timeout)
+    client.session.hooks["response"].append(stats.response_hook)
+    generator = LoadGenerator(client, scenarios, stats, concurrency)
+
+    stop = threading.Event()
+    reporter = threading.Thread(
+        target=report_intervals, args=(stats, args.interval, stop),
+        daemon=True)
+    reporter.start()
+    try:
+        if args.rps:
+            generator.run_open(args.rps, args.duration)
+        else:
+            generator.run_closed(args.duration)
+    except KeyboardInterrupt:
+        generator.stop()
+    finally:
+        stop.set()
+        reporter.join()
+        client.close()
+    print_summary(stats)
+
+
+if __name__ == "__main__":
+    main()
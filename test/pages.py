@@ -0,0 +1,203 @@
+import pytest
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from waits import PAGE_FIELDS_SCRIPT, WaitEngine
+
+
+# Состояние всех элементов страницы за один execute_script
+SNAPSHOT_SCRIPT = PAGE_FIELDS_SCRIPT + """
+const locators = arguments[0];
+const find = (how, what) => how === "xpath"
+    ? document.evaluate(what, document, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+    : document.querySelector(what);
+const isVisible = (el) => {
+    const style = window.getComputedStyle(el);
+    return style.visibility !== "hidden" && style.display !== "none"
+        && parseFloat(style.opacity || "1") > 0
+        && el.getClientRects().length > 0;
+};
+const elements = {};
+for (const [name, [how, what]] of Object.entries(locators)) {
+    let el = null;
+    try { el = find(how, what); } catch (e) {}
+    elements[name] = el ? {
+        found: true, visible: isVisible(el), text: el.innerText || ""
+    } : {found: false, visible: false, text: ""};
+}
+return {...page, elements: elements};
+"""
+
+# Локаторы Selenium, которые сводятся к CSS-селектору
+_CSS_LOCATORS = {
+    By.CSS_SELECTOR: "{}",
+    By.ID: "[id='{}']",
+    By.NAME: "[name='{}']",
+    By.CLASS_NAME: ".{}",
+    By.TAG_NAME: "{}",
+}
+
+
+def js_locator(locator):
+    """Локатор Selenium в виде ["css" | "xpath", селектор]."""
+    how, what = locator
+    if how == By.XPATH:
+        return ["xpath", what]
+    return ["css", _CSS_LOCATORS[how].format(what)]
+
+
+class PageSnapshot:
+    """Снимок страницы: заголовок, URL и состояние именованных элементов."""
+
+    def __init__(self, data):
+        self.data = data
+        self.url = data["url"]
+        self.title = data["title"]
+        self.elements = data["elements"]
+
+    def found(self, name):
+        return self.elements[name]["found"]
+
+    def visible(self, name):
+        return self.elements[name]["visible"]
+
+    def text(self, name):
+        return self.elements[name]["text"]
+
+    def __repr__(self):
+        return f"PageSnapshot(title={self.title!r}, elements={self.elements})"
+
+
+class BasePage:
+    """Базовый page-объект Кинопоиска."""
+
+    PATH = ""
+    # Имя страницы в метриках производительности и бюджетах perf_budget
+    NAME = "page"
+
+    def __init__(self, driver, timeout=30):
+        self.driver = driver
+        self.wait = WaitEngine(driver, timeout=timeout)
+        self.last_snapshot = None
+
+    @property
+    def url(self):
+        return self.driver.base_url + self.PATH
+
+    def open(self):
+        """Открытие страницы с проверкой на капчу и ошибки."""
+        self.driver.get(self.url)
+        self.wait.check_page()
+        self.record_metrics()
+        return self
+
+    def record_metrics(self):
+        """Метрики производительности страницы, если они включены."""
+        recorder = getattr(self.driver, "perf_recorder", None)
+        if recorder is not None:
+            recorder.capture(self.driver, self.NAME)
+
+    def wait_title(self, text, ignore_case=False):
+        """Ожидание заголовка страницы, содержащего text."""
+        if ignore_case:
+            text = text.lower()
+            return self.wait.until(
+                lambda d: text in d.title.lower(),
+                f"Заголовок не содержит '{text}'", label="title")
+        return self.wait.until(
+            lambda d: text in d.title, f"Заголовок не содержит '{text}'",
+            label="title")
+
+    def visible(self, locator):
+        """Ожидание видимого элемента."""
+        return self.wait.until(
+            EC.visibility_of_element_located(locator),
+            f"Элемент не отображается: {locator}", label="visible")
+
+    def snapshot(self, locators):
+        """Видимость и текст всех locators за один запрос к браузеру.
+
+        locators - словарь {имя: (By, селектор)}.
+        """
+        data = self.driver.execute_script(SNAPSHOT_SCRIPT, {
+            name: js_locator(locator) for name, locator in locators.items()
+        })
+        self.last_snapshot = PageSnapshot(data)
+        return self.last_snapshot
+
+    def wait_snapshot(self, locators, predicate, message=""):
+        """Опрос снимков страницы до выполнения predicate(snapshot).
+
+        Последний снимок остается в last_snapshot и после таймаута.
+        """
+        self.last_snapshot = None
+
+        def condition(driver):
+            snapshot = self.snapshot(locators)
+            return snapshot if predicate(snapshot) else None
+
+        return self.wait.until(
+            condition, message,
+            page=lambda: self.last_snapshot and self.last_snapshot.data,
+            label="snapshot")
+
+    def require_browser(self, action):
+        """Пропуск теста, если action невозможно без браузера.
+
+        Офлайн-драйвер над снимками DOM (static) не выполняет ввод.
+        """
+        if getattr(self.driver, "static", False):
+            pytest.skip(f"{action} требует браузера")
+
+    def clickable(self, locator):
+        """Ожидание кликабельного элемента."""
+        return self.wait.until(
+            EC.element_to_be_clickable(locator),
+            f"Элемент не кликабелен: {locator}", label="clickable")
+
+
+class MainPage(BasePage):
+    """Главная страница."""
+
+    NAME = "main"
+
+    SEARCH_INPUT = (By.CSS_SELECTOR, "input[name='kp_query']")
+    FOOTER = (By.CSS_SELECTOR, "footer")
+    LOGIN_BUTTON = (By.XPATH, "//button[contains(text(), 'Войти')]")
+
+    def search(self, query):
+        """Ввод поискового запроса и отправка формы."""
+        self.require_browser("Поиск")
+        search_input = self.visible(self.SEARCH_INPUT)
+        ActionChains(self.driver).send_keys_to_element(
+            search_input, query).perform()
+        search_input.submit()
+        return SearchResultsPage(self.driver, self.wait.timeout)
+
+
+class SearchResultsPage(BasePage):
+    """Страница результатов поиска."""
+
+    NAME = "search"
+
+    @staticmethod
+    def result_locator(title):
+        return (By.XPATH, f"//*[contains(text(), '{title}')]")
+
+
+class MoviePage(BasePage):
+    """Страница фильма."""
+
+    NAME = "movie"
+
+    RATING = (By.CSS_SELECTOR, "span.styles_ratingKpTop__8p7mM")
+
+    def __init__(self, driver, film_id=325, timeout=30):
+        super().__init__(driver, timeout)
+        self.film_id = film_id
+
+    @property
+    def url(self):
+        return f"{self.driver.base_url}film/{self.film_id}/"
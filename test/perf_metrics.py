@@ -0,0 +1,109 @@
+import json
+import time
+from pathlib import Path
+
+from rate_limit import file_lock
+
+
+# Navigation Timing, paint, LCP и CLS текущей страницы. LCP и сдвиги
+# макета доступны только через PerformanceObserver с buffered: true
+METRICS_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const result = {ttfb: null, dom_content_loaded: null, load: null,
+                fcp: null, lcp: null, cls: 0, transfer_size: 0, requests: 0};
+const nav = performance.getEntriesByType("navigation")[0];
+if (nav) {
+    result.ttfb = nav.responseStart - nav.startTime;
+    result.dom_content_loaded = nav.domContentLoadedEventEnd - nav.startTime;
+    result.load = nav.loadEventEnd > 0 ? nav.loadEventEnd - nav.startTime
+                                       : null;
+    result.transfer_size = nav.transferSize || 0;
+    result.requests = 1;
+}
+for (const entry of performance.getEntriesByType("resource")) {
+    result.transfer_size += entry.transferSize || 0;
+    result.requests += 1;
+}
+const fcp = performance.getEntriesByName("first-contentful-paint")[0];
+if (fcp) {
+    result.fcp = fcp.startTime;
+}
+const observe = (type, callback) => {
+    try {
+        const observer = new PerformanceObserver(
+            (list) => list.getEntries().forEach(callback));
+        observer.observe({type: type, buffered: true});
+    } catch (e) {}
+};
+observe("largest-contentful-paint", (entry) => {
+    result.lcp = entry.startTime;
+});
+observe("layout-shift", (entry) => {
+    if (!entry.hadRecentInput) {
+        result.cls += entry.value;
+    }
+});
+setTimeout(() => done(result), 100);
+"""
+
+# Единицы: миллисекунды для времени, байты для transfer_size
+METRICS = (
+    "ttfb", "dom_content_loaded", "load", "fcp", "lcp", "cls",
+    "transfer_size", "requests",
+)
+
+
+class PerfRecorder:
+    """Метрики производительности страниц, открытых за один тест."""
+
+    def __init__(self, test, browser, history_path=None):
+        self.test = test
+        self.browser = browser
+        self.history_path = history_path
+        self.navigations = []
+
+    def capture(self, driver, page):
+        """Снятие метрик текущей страницы и запись во временной ряд."""
+        try:
+            metrics = driver.execute_async_script(METRICS_SCRIPT)
+        except Exception as e:
+            print(f"Не удалось снять метрики страницы {page}: {e}")
+            return None
+
+        record = {
+            "time": time.time(),
+            "test": self.test,
+            "browser": self.browser,
+            "page": page,
+            "url": driver.current_url,
+            **{name: metrics.get(name) for name in METRICS},
+        }
+        self.navigations.append(record)
+        if self.history_path:
+            self._append(record)
+        return record
+
+    def violations(self, budgets):
+        """Нарушения бюджетов: список строк.
+
+        budgets - список пар (страница или None для всех, {метрика: лимит}).
+        """
+        found = []
+        for page, limits in budgets:
+            for record in self.navigations:
+                if page is not None and record["page"] != page:
+                    continue
+                for metric, limit in limits.items():
+                    value = record.get(metric)
+                    if value is not None and value > limit:
+                        found.append(
+                            f"{record['page']}: {metric} = {value:.6g} "
+                            f"> {limit} ({record['url']})")
+        return found
+
+    def _append(self, record):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        Path(self.history_path).parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(str(self.history_path) + ".lock"):
+            with open(self.history_path, "a", encoding="utf-8") as history:
+                history.write(line)
@@ -0,0 +1,172 @@
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+
+# Команды WebDriver протокола Selenium по категориям
+NAVIGATION_COMMANDS = {"get", "refresh", "goBack", "goForward"}
+FIND_COMMANDS = {
+    "findElement", "findElements", "findChildElement", "findChildElements",
+}
+
+CATEGORIES = ("launch", "navigation", "waiting", "commands", "assertion")
+
+
+class CommandProfiler:
+    """Хронометраж всех команд WebDriver одного браузера.
+
+    Оборачивает command_executor.execute драйвера, поэтому видит каждую
+    команду, включая вызовы из WebDriverWait, ActionChains и элементов.
+    Время раскладывается по категориям: запуск браузера, навигация,
+    ожидания (явные через WaitEngine и неявные в поиске элементов),
+    прочие команды и время теста вне браузера (проверки).
+    """
+
+    def __init__(self):
+        self._wait_labels = []
+        self.start()
+
+    def install(self, driver):
+        """Перехват команд драйвера."""
+        execute = driver.command_executor.execute
+
+        def timed_execute(command, params=None):
+            started = time.perf_counter()
+            try:
+                return execute(command, params)
+            finally:
+                self._record(command, time.perf_counter() - started)
+
+        driver.command_executor.execute = timed_execute
+        driver.profiler = self
+        return driver
+
+    def start(self, launch=0.0):
+        """Начало нового теста; launch - время получения браузера."""
+        self.launch = launch
+        self.stacks = defaultdict(float)
+        self.counts = defaultdict(int)
+
+    @contextmanager
+    def waiting(self, label):
+        """Явное ожидание: команды внутри учитываются как ожидание."""
+        label = label.replace(";", "_").replace(" ", "_")
+        self._wait_labels.append(label)
+        stack = f"waiting;explicit;{label}"
+        before = self._stack_total(stack)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._wait_labels.pop()
+            elapsed = time.perf_counter() - started
+            idle = elapsed - (self._stack_total(stack) - before)
+            self.stacks[f"{stack};poll_sleep"] += max(idle, 0.0)
+
+    def summary(self, duration):
+        """Итог теста: разбивка по категориям и свернутые стеки."""
+        split = dict.fromkeys(CATEGORIES, 0.0)
+        split["launch"] = self.launch
+        for stack, seconds in self.stacks.items():
+            split[stack.split(";", 1)[0]] += seconds
+        busy = split["navigation"] + split["waiting"] + split["commands"]
+        split["assertion"] = max(duration - busy, 0.0)
+
+        stacks = dict(self.stacks)
+        if self.launch:
+            stacks["launch"] = self.launch
+        stacks["assertion"] = split["assertion"]
+        return {
+            "total": self.launch + duration,
+            "split": split,
+            "stacks": stacks,
+            "counts": dict(self.counts),
+        }
+
+    def _record(self, command, seconds):
+        if self._wait_labels:
+            stack = f"waiting;explicit;{self._wait_labels[-1]};{command}"
+        elif command in NAVIGATION_COMMANDS:
+            stack = f"navigation;{command}"
+        elif command in FIND_COMMANDS:
+            stack = f"waiting;implicit;{command}"
+        else:
+            stack = f"commands;{command}"
+        self.stacks[stack] += seconds
+        self.counts[command] += 1
+
+    def _stack_total(self, prefix):
+        return sum(
+            seconds for stack, seconds in self.stacks.items()
+            if stack.startswith(prefix + ";"))
+
+
+def folded(name, profile):
+    """Свернутые стеки (формат flamegraph.pl/speedscope), микросекунды."""
+    return "\n".join(
+        f"{name};{stack} {round(seconds * 1_000_000)}"
+        for stack, seconds in sorted(profile["stacks"].items())
+        if seconds > 0)
+
+
+class ProfileReport:
+    """Плагин pytest: профили тестов в Allure и в JSON-файл."""
+
+    def __init__(self, config, path):
+        self.config = config
+        self.path = Path(path)
+        self.profiles = {}
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        driver = item.funcargs.get("driver")
+        profiler = getattr(driver, "profiler", None)
+        if report.when != "call" or profiler is None:
+            return
+
+        profile = profiler.summary(call.duration)
+        report.user_properties.append(("webdriver_profile", profile))
+
+        import allure
+
+        split = ", ".join(
+            f"{name} {seconds:.2f} с"
+            for name, seconds in profile["split"].items())
+        allure.attach(
+            f"{split}\n\n{folded(item.name, profile)}",
+            name="webdriver_profile",
+            attachment_type=allure.attachment_type.TEXT)
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "call":
+            return
+        for name, value in report.user_properties:
+            if name == "webdriver_profile":
+                self.profiles[report.nodeid] = value
+
+    def pytest_sessionfinish(self, session):
+        if hasattr(self.config, "workerinput") or not self.profiles:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            json.dumps(self.profiles, indent=2, ensure_ascii=False),
+            encoding="utf-8")
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.profiles:
+            return
+        terminalreporter.write_sep("-", "Профиль WebDriver, секунды")
+        terminalreporter.write_line(
+            f"{'Тест':<40}" + "".join(f"{name:>12}" for name in CATEGORIES))
+        for nodeid, profile in sorted(self.profiles.items()):
+            terminalreporter.write_line(
+                f"{nodeid.split('::')[-1][:40]:<40}" + "".join(
+                    f"{profile['split'][name]:>12.2f}"
+                    for name in CATEGORIES))
+        terminalreporter.write_line(f"Профили: {self.path}")
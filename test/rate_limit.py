@@ -0,0 +1,171 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# Приоритетные полосы: чем меньше число, тем раньше выдается токен
+LANES = {"smoke": 0, "default": 1, "bulk": 2}
+
+# Ожидающий запрос без обновления дольше этого срока считается брошенным
+STALE_WAITER_SECONDS = 30
+
+
+@contextmanager
+def file_lock(path):
+    """Эксклюзивная блокировка файла, общая для всех xdist-воркеров."""
+    with open(path, "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def retry_after_seconds(response, default=1.0):
+    """Значение заголовка Retry-After в секундах."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+        return max(retry_at - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return default
+
+
+class RateLimiter:
+    """Token bucket, разделяемый между процессами через файл состояния.
+
+    Состояние ведра (токены, блокировка по Retry-After, ожидающие запросы
+    и счетчики) хранится в JSON-файле и меняется только под файловой
+    блокировкой, поэтому все xdist-воркеры расходуют одну общую квоту.
+    """
+
+    def __init__(self, path, rate, burst=None):
+        self.path = str(path)
+        self.lock_path = self.path + ".lock"
+        self.rate = float(rate)
+        self.burst = float(burst or max(rate, 1))
+        self.lane = "default"
+
+    def reset(self):
+        """Начальное состояние ведра (вызывается один раз за запуск)."""
+        with file_lock(self.lock_path):
+            self._write_initial()
+
+    def acquire(self, lane=None):
+        """Ожидание токена с учетом приоритета полосы."""
+        priority = LANES.get(lane or self.lane, LANES["default"])
+        waiter = f"{os.getpid()}-{threading.get_ident()}"
+        started = time.time()
+
+        while True:
+            with file_lock(self.lock_path):
+                state = self._read()
+                now = time.time()
+                self._refill(state, now)
+
+                waiters = {
+                    key: value for key, value in state["waiters"].items()
+                    if now - value[1] < STALE_WAITER_SECONDS
+                }
+                ahead = any(
+                    value[0] < priority
+                    for key, value in waiters.items() if key != waiter
+                )
+                blocked = state["blocked_until"] - now
+
+                if blocked <= 0 and not ahead and state["tokens"] >= 1:
+                    state["tokens"] -= 1
+                    waiters.pop(waiter, None)
+                    state["waiters"] = waiters
+                    self._count(state, time.time() - started)
+                    self._write(state)
+                    return
+
+                waiters[waiter] = [priority, now]
+                state["waiters"] = waiters
+                self._write(state)
+
+            if blocked > 0:
+                delay = blocked
+            elif ahead:
+                delay = 0.05
+            else:
+                delay = (1 - state["tokens"]) / self.rate
+            time.sleep(min(max(delay, 0.01), 1.0))
+
+    def block(self, seconds):
+        """Пауза для всех воркеров после ответа 429."""
+        with file_lock(self.lock_path):
+            state = self._read()
+            state["blocked_until"] = max(
+                state["blocked_until"], time.time() + seconds)
+            state["tokens"] = 0.0
+            state["stats"]["rate_limited"] += 1
+            self._write(state)
+
+    def stats(self):
+        """Общие счетчики всех воркеров."""
+        with file_lock(self.lock_path):
+            return self._read()["stats"]
+
+    def _refill(self, state, now):
+        elapsed = max(now - state["updated"], 0.0)
+        state["tokens"] = min(
+            self.burst, state["tokens"] + elapsed * self.rate)
+        state["updated"] = now
+
+    def _count(self, state, waited):
+        stats = state["stats"]
+        stats["requests"] += 1
+        if waited > 0.01:
+            stats["throttled"] += 1
+            stats["throttled_seconds"] += waited
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            self._write_initial()
+        with open(self.path, encoding="utf-8") as state_file:
+            return json.load(state_file)
+
+    def _write_initial(self):
+        self._write({
+            "tokens": self.burst,
+            "updated": time.time(),
+            "blocked_until": 0.0,
+            "waiters": {},
+            "stats": {
+                "requests": 0,
+                "throttled": 0,
+                "throttled_seconds": 0.0,
+                "rate_limited": 0,
+            },
+        })
+
+    def _write(self, state):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as state_file:
+            json.dump(state, state_file)
+        os.replace(tmp_path, self.path)
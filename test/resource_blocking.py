@@ -0,0 +1,200 @@
+import json
+
+
+# URL-шаблоны Chrome DevTools (Network.setBlockedURLs) по типам ресурсов
+RESOURCE_PATTERNS = {
+    "image": [
+        "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*",
+        "*.svg*", "*.ico*", "*avatars.mds.yandex.net*",
+    ],
+    "media": ["*.mp4*", "*.webm*", "*.m3u8*", "*.mpd*", "*strm.yandex.ru*"],
+    "font": ["*.woff*", "*.ttf*", "*.otf*"],
+    "ads": [
+        "*an.yandex.ru*", "*yandex.ru/ads*", "*adfox*",
+        "*doubleclick.net*", "*googlesyndication.com*",
+    ],
+    "analytics": [
+        "*mc.yandex.ru*", "*google-analytics.com*",
+        "*googletagmanager.com*", "*top-fwz1.mail.ru*",
+    ],
+}
+
+# Шрифты по умолчанию не блокируем: от них зависит раскладка страницы
+DEFAULT_TYPES = "image,media,ads,analytics"
+
+# Настройки Firefox, которыми можно отключить часть ресурсов
+FIREFOX_PREFS = {
+    "image": {"permissions.default.image": 2},
+    "media": {
+        "media.autoplay.default": 5,
+        "media.autoplay.blocking_policy": 2,
+    },
+    "font": {"gfx.downloadable_fonts.enabled": False},
+    "ads": {"privacy.trackingprotection.enabled": True},
+    "analytics": {"privacy.trackingprotection.enabled": True},
+}
+
+
+# Браузеры с Chrome DevTools Protocol (browserName в capabilities)
+CDP_BROWSERS = ("chrome", "msedge")
+
+
+def supports_cdp(driver):
+    """Поддержка CDP: у Remote метод execute_cdp_cmd есть всегда, но в
+    Firefox он падает с RuntimeError.
+    """
+    return driver.caps.get("browserName") in CDP_BROWSERS
+
+
+class ResourceBlocker:
+    """Блокировка тяжелых ресурсов страниц и стратегия загрузки.
+
+    В Chrome и Edge запросы блокируются через DevTools по URL-шаблонам,
+    а статистика запросов берется из performance-лога. Firefox не умеет
+    блокировать по шаблонам без расширений, поэтому для него включаются
+    только соответствующие настройки браузера и статистики нет.
+    """
+
+    def __init__(self, types=(), patterns=(), page_load_strategy="normal",
+                 measure=False):
+        self.types = [name for name in types if name and name != "none"]
+        self.patterns = list(patterns)
+        for name in self.types:
+            self.patterns.extend(RESOURCE_PATTERNS[name])
+        self.page_load_strategy = page_load_strategy
+        self.enabled = measure or bool(self.patterns)
+
+    @classmethod
+    def from_config(cls, config):
+        """Настройки из командной строки.
+
+        --block-resources=none ничего не блокирует, а только собирает
+        статистику базового запуска, с которым сравнивается экономия.
+        """
+        return cls.from_options(
+            config.getoption("--block-resources"),
+            config.getoption("--block-url"),
+            config.getoption("--page-load-strategy"),
+        )
+
+    @classmethod
+    def from_options(cls, block_resources=None, block_url=(),
+                     page_load_strategy="normal"):
+        """Настройки по значениям опций --block-resources, --block-url и
+        --page-load-strategy.
+        """
+        return cls(
+            types=block_resources.split(",") if block_resources else (),
+            patterns=block_url or (),
+            page_load_strategy=page_load_strategy,
+            measure=block_resources is not None,
+        )
+
+    @property
+    def blocking(self):
+        return bool(self.patterns)
+
+    def apply_options(self, options, browser):
+        """Настройка опций браузера до его запуска."""
+        options.page_load_strategy = self.page_load_strategy
+        if not self.enabled:
+            return
+        if browser == "firefox":
+            if not self.blocking:
+                return
+            for name in self.types:
+                for key, value in FIREFOX_PREFS[name].items():
+                    options.set_preference(key, value)
+        else:
+            options.set_capability(
+                "goog:loggingPrefs", {"performance": "ALL"})
+
+    def attach(self, driver):
+        """Включение блокировки в запущенном браузере."""
+        if self.blocking and supports_cdp(driver):
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd(
+                "Network.setBlockedURLs", {"urls": self.patterns})
+
+    def start(self, driver):
+        """Сброс накопленного лога перед тестом."""
+        if self.enabled:
+            self._read_log(driver)
+
+    def collect(self, driver):
+        """Статистика запросов за тест или None, если лог недоступен."""
+        if not self.enabled:
+            return None
+        entries = self._read_log(driver)
+        if entries is None:
+            return None
+
+        stats = {"requests": 0, "blocked": 0, "bytes": 0}
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            method, params = message.get("method"), message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                stats["requests"] += 1
+            elif method == "Network.loadingFinished":
+                stats["bytes"] += int(params.get("encodedDataLength", 0))
+            elif (method == "Network.loadingFailed"
+                    and params.get("blockedReason")):
+                stats["blocked"] += 1
+        return stats
+
+    @staticmethod
+    def _read_log(driver):
+        try:
+            return driver.get_log("performance")
+        except Exception:
+            return None
+
+
+class ResourceReport:
+    """Плагин pytest: сводка ресурсов по тестам в конце запуска.
+
+    Статистика приходит в user_properties отчетов, поэтому собирается и
+    с xdist-воркеров. Запуск без блокировки (--block-resources=none)
+    сохраняется в кэше pytest как базовый; запуск с блокировкой
+    показывает экономию относительно него. Без кэша (-p no:cacheprovider)
+    экономия не считается.
+    """
+
+    CACHE_KEY = "resources/baseline"
+
+    def __init__(self, config):
+        self.config = config
+        self.stats = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == "resources":
+                self.stats[report.nodeid] = value
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.stats or hasattr(self.config, "workerinput"):
+            return
+
+        blocking = self.config.getoption("--block-resources") != "none"
+        cache = getattr(self.config, "cache", None)
+        baseline = cache.get(self.CACHE_KEY, {}) if cache else {}
+        if not blocking and cache is not None:
+            baseline.update(self.stats)
+            cache.set(self.CACHE_KEY, baseline)
+
+        terminalreporter.write_sep("-", "Загруженные ресурсы страниц")
+        terminalreporter.write_line(
+            f"{'Тест':<60} {'запросов':>9} {'блок.':>6} "
+            f"{'КБ':>8} {'сэконом. КБ':>12} {'сэконом. запр.':>15}")
+        for nodeid, stats in sorted(self.stats.items()):
+            base = baseline.get(nodeid) if blocking else None
+            saved_kb = saved_requests = "-"
+            if base:
+                saved_kb = f"{(base['bytes'] - stats['bytes']) / 1024:.0f}"
+                saved_requests = base["requests"] - stats["requests"]
+            terminalreporter.write_line(
+                f"{nodeid[-60:]:<60} {stats['requests']:>9} "
+                f"{stats['blocked']:>6} {stats['bytes'] / 1024:>8.0f} "
+                f"{saved_kb:>12} {saved_requests:>15}")
@@ -0,0 +1,41 @@
+"""Плагин pytest: история длительностей тестов и планировщик xdist."""
+import pytest
+
+from duration_history import DurationReport
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """Планировщик по длительностям вместо --dist=load."""
+    if not config.getoption("--duration-schedule"):
+        return None
+
+    from xdist_scheduler import DurationScheduling
+
+    return DurationScheduling(config, log)
+
+
+def _has_cache(config):
+    # История хранится в кэше pytest, без него (-p no:cacheprovider)
+    # длительности не записываются
+    return getattr(config, "cache", None) is not None
+
+
+def pytest_configure(config):
+    if config.getoption("--duration-schedule") and not _has_cache(config):
+        raise pytest.UsageError(
+            "--duration-schedule: история длительностей хранится в кэше "
+            "pytest, он отключен (-p no:cacheprovider)")
+    # Отчеты всех воркеров собирает главный процесс
+    if not hasattr(config, "workerinput") and _has_cache(config):
+        config.pluginmanager.register(
+            DurationReport(config), "duration-report")
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--duration-schedule", action="store_true",
+        help="Распределять тесты между xdist-воркерами по истории "
+             "длительностей: долгие первыми, браузерные - на воркеры "
+             "с запущенным браузером"
+    )
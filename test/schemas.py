@@ -0,0 +1,241 @@
+"""Схемы ответов API Kinopoisk и их компиляция в функции проверки.
+
+Схема описывается структурами Python:
+    тип или кортеж типов - допустимые типы значения (None - null);
+    [схема] - массив, каждый элемент которого соответствует схеме;
+    {"ключ": схема} - объект с обязательными ключами, "ключ?" - с
+    необязательным; лишние ключи допускаются.
+
+Схема один раз компилируется в дерево замыканий, которые только
+возвращают True/False. Сообщения с JSON-путем строятся повторным
+обходом, и только для невалидного ответа.
+"""
+
+NUMBER = (float, None)
+STRING = (str, None)
+INTEGER = (int, None)
+
+
+def _types(spec):
+    """Точные типы: bool не проходит как int, int проходит как float."""
+    types = set(spec) if isinstance(spec, tuple) else {spec}
+    if None in types:
+        types.discard(None)
+        types.add(type(None))
+    if float in types:
+        types.add(int)
+    return frozenset(types)
+
+
+def _compile(spec):
+    if isinstance(spec, dict):
+        fields = tuple(
+            (key.rstrip("?"), key.endswith("?"), _compile(value))
+            for key, value in spec.items())
+
+        def check_object(value):
+            if type(value) is not dict:
+                return False
+            for key, optional, check in fields:
+                if key in value:
+                    if not check(value[key]):
+                        return False
+                elif not optional:
+                    return False
+            return True
+
+        return check_object
+
+    if isinstance(spec, list):
+        check_item = _compile(spec[0])
+
+        def check_array(value):
+            return type(value) is list and all(map(check_item, value))
+
+        return check_array
+
+    types = _types(spec)
+
+    def check_type(value):
+        return type(value) in types
+
+    return check_type
+
+
+def _type_name(spec):
+    if isinstance(spec, dict):
+        return "object"
+    if isinstance(spec, list):
+        return "array"
+    return " | ".join(sorted(
+        "null" if t is type(None) else t.__name__ for t in _types(spec)))
+
+
+def _explain(spec, value, path, errors):
+    """Все несоответствия value схеме spec с JSON-путями."""
+    if isinstance(spec, dict):
+        if type(value) is not dict:
+            errors.append(f"{path}: ожидался object, получен {value!r:.60}")
+            return
+        for key, item_spec in spec.items():
+            name = key.rstrip("?")
+            if name in value:
+                _explain(item_spec, value[name], f"{path}.{name}", errors)
+            elif not key.endswith("?"):
+                errors.append(f"{path}.{name}: отсутствует")
+    elif isinstance(spec, list):
+        if type(value) is not list:
+            errors.append(f"{path}: ожидался array, получен {value!r:.60}")
+            return
+        for index, item in enumerate(value):
+            _explain(spec[0], item, f"{path}[{index}]", errors)
+    elif type(value) not in _types(spec):
+        errors.append(
+            f"{path}: ожидался {_type_name(spec)}, получен {value!r:.60}")
+
+
+class Schema:
+    """Скомпилированная схема ответа."""
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.spec = spec
+        self.check = _compile(spec)
+
+    def errors(self, data):
+        """Список ошибок с JSON-путями; пустой для валидного ответа."""
+        if self.check(data):
+            return []
+        errors = []
+        _explain(self.spec, data, "$", errors)
+        return errors
+
+    def validate(self, data):
+        """AssertionError со всеми ошибками, если ответ не по схеме."""
+        errors = self.errors(data)
+        assert not errors, (
+            f"Ответ не по схеме {self.name}:\n" + "\n".join(errors[:20]))
+        return data
+
+
+COUNTRIES = [{"country": str}]
+GENRES = [{"genre": str}]
+
+FILM = Schema("film", {
+    "kinopoiskId": int,
+    "imdbId": STRING,
+    "nameRu": STRING,
+    "nameEn": STRING,
+    "nameOriginal": STRING,
+    "posterUrl": str,
+    "posterUrlPreview": str,
+    "coverUrl?": STRING,
+    "logoUrl?": STRING,
+    "reviewsCount?": INTEGER,
+    "ratingGoodReview?": NUMBER,
+    "ratingGoodReviewVoteCount?": INTEGER,
+    "ratingKinopoisk": NUMBER,
+    "ratingKinopoiskVoteCount": INTEGER,
+    "ratingImdb": NUMBER,
+    "ratingImdbVoteCount": INTEGER,
+    "ratingFilmCritics?": NUMBER,
+    "ratingFilmCriticsVoteCount?": INTEGER,
+    "ratingAwait?": NUMBER,
+    "ratingAwaitCount?": INTEGER,
+    "ratingRfCritics?": NUMBER,
+    "ratingRfCriticsVoteCount?": INTEGER,
+    "webUrl": str,
+    "year": INTEGER,
+    "filmLength": INTEGER,
+    "slogan?": STRING,
+    "description": STRING,
+    "shortDescription?": STRING,
+    "editorAnnotation?": STRING,
+    "isTicketsAvailable?": bool,
+    "productionStatus?": STRING,
+    "type": str,
+    "ratingMpaa?": STRING,
+    "ratingAgeLimits?": STRING,
+    "hasImax?": (bool, None),
+    "has3D?": (bool, None),
+    "lastSync?": STRING,
+    "countries": COUNTRIES,
+    "genres": GENRES,
+    "startYear?": INTEGER,
+    "endYear?": INTEGER,
+    "serial?": (bool, None),
+    "shortFilm?": (bool, None),
+    "completed?": (bool, None),
+})
+
+SEASONS = Schema("seasons", {
+    "total": int,
+    "items": [{
+        "number": int,
+        "episodes": [{
+            "seasonNumber": int,
+            "episodeNumber": int,
+            "nameRu": STRING,
+            "nameEn": STRING,
+            "synopsis": STRING,
+            "releaseDate": STRING,
+        }],
+    }],
+})
+
+AWARDS = Schema("awards", {
+    "total": int,
+    "items": [{
+        "name": str,
+        "win": bool,
+        "imageUrl": STRING,
+        "nominationName": STRING,
+        "year": int,
+        "persons": [{
+            "kinopoiskId": int,
+            "webUrl": STRING,
+            "nameRu": STRING,
+            "nameEn": STRING,
+            "sex?": STRING,
+            "posterUrl": STRING,
+            "growth?": INTEGER,
+            "birthday?": STRING,
+            "death?": STRING,
+            "age?": INTEGER,
+            "birthplace?": STRING,
+            "deathplace?": STRING,
+            "profession?": STRING,
+        }],
+    }],
+})
+
+SIMILARS = Schema("similars", {
+    "total": int,
+    "items": [{
+        "filmId": int,
+        "nameRu": STRING,
+        "nameEn": STRING,
+        "nameOriginal": STRING,
+        "posterUrl": str,
+        "posterUrlPreview": str,
+        "relationType": str,
+    }],
+})
+
+PREMIERES = Schema("premieres", {
+    "total": int,
+    "items": [{
+        "kinopoiskId": int,
+        "nameRu": STRING,
+        "nameEn": STRING,
+        "year": INTEGER,
+        "posterUrl": str,
+        "posterUrlPreview": str,
+        "countries": COUNTRIES,
+        "genres": GENRES,
+        "duration": INTEGER,
+        "premiereRu": str,
+    }],
+})
+
+ERROR = Schema("error", {"message": str})
@@ -0,0 +1,139 @@
+import hashlib
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+class ScreenshotService:
+    """Плагин pytest: один скриншот на падение, сжатие в фоновом потоке.
+
+    Снимок PNG забирается из браузера в основном потоке, а уменьшение до
+    max_width, перекодирование в JPEG/WebP (через Pillow, если он
+    установлен) и поиск одинаковых кадров выполняются в отдельном потоке,
+    пока идет teardown теста. В Allure вложения добавляются в фазе
+    teardown, не превышая общий бюджет байтов на запуск.
+    """
+
+    def __init__(self, image_format="jpeg", max_width=1280, quality=70,
+                 budget=50 * 1024 * 1024):
+        self.image_format = image_format
+        self.max_width = max_width
+        self.quality = quality
+        self.budget = budget
+        self.used = 0
+        self.skipped = 0
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="screenshots")
+
+    @classmethod
+    def from_config(cls, config):
+        budget = config.getoption("--screenshot-budget-mb") * 1024 * 1024
+        # Бюджет на запуск делится между xdist-воркерами
+        workers = getattr(config, "workerinput", {}).get("workercount", 1)
+        return cls(
+            image_format=config.getoption("--screenshot-format"),
+            max_width=config.getoption("--screenshot-max-width"),
+            quality=config.getoption("--screenshot-quality"),
+            budget=budget // workers,
+        )
+
+    def capture(self, item, driver, name):
+        """Снимок экрана для теста item (не больше одного на тест)."""
+        if item.nodeid in self._pending:
+            return
+        try:
+            png = driver.get_screenshot_as_png()
+        except Exception as e:
+            print(f"Не удалось сделать скриншот: {e}")
+            return
+        self._pending[item.nodeid] = (
+            name, self._executor.submit(self._encode, png))
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        """Скриншот при падении теста и вложение в отчет в teardown."""
+        outcome = yield
+        report = outcome.get_result()
+
+        if report.when == "call" and report.failed:
+            driver = item.funcargs.get("driver")
+            if driver is not None:
+                self.capture(item, driver, "screenshot_on_failure")
+        elif report.when == "teardown":
+            self._attach(item)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.skipped:
+            terminalreporter.write_line(
+                f"Скриншотов не приложено из-за лимита: {self.skipped}")
+
+    def pytest_unconfigure(self, config):
+        self._executor.shutdown(wait=True)
+
+    def _attach(self, item):
+        pending = self._pending.pop(item.nodeid, None)
+        if pending is None:
+            return
+        name, future = pending
+        try:
+            encoded = future.result()
+        except Exception as e:
+            print(f"Не удалось обработать скриншот: {e}")
+            return
+        if encoded is None:
+            return
+
+        body, image_format = encoded
+        with self._lock:
+            if self.used + len(body) > self.budget:
+                self.skipped += 1
+                return
+            self.used += len(body)
+
+        import allure
+
+        if image_format == "webp":
+            # В allure.attachment_type нет WebP
+            allure.attach(body, name=name, attachment_type="image/webp",
+                          extension="webp")
+        else:
+            attachment_type = {
+                "png": allure.attachment_type.PNG,
+                "jpeg": allure.attachment_type.JPG,
+            }[image_format]
+            allure.attach(body, name=name, attachment_type=attachment_type)
+
+    def _encode(self, png):
+        """(байты, формат) или None для уже приложенного кадра."""
+        try:
+            from PIL import Image
+        except ImportError:
+            return self._unique(png, png, "png")
+
+        image = Image.open(io.BytesIO(png))
+        if image.width > self.max_width:
+            height = round(image.height * self.max_width / image.width)
+            image = image.resize((self.max_width, height))
+        if self.image_format == "png":
+            image_format, options = "png", {"optimize": True}
+        else:
+            image = image.convert("RGB")
+            image_format = self.image_format
+            options = {"quality": self.quality}
+
+        output = io.BytesIO()
+        image.save(output, format=image_format.upper(), **options)
+        return self._unique(image.tobytes(), output.getvalue(), image_format)
+
+    def _unique(self, pixels, body, image_format):
+        digest = hashlib.sha1(pixels).digest()
+        with self._lock:
+            if digest in self._seen:
+                return None
+            self._seen.add(digest)
+        return body, image_format
@@ -1,11 +1,16 @@
+import pytest
+
+from catalogue_dataset import check_film
 from config import Config
+from schemas import AWARDS, ERROR, FILM, PREMIERES, SEASONS, SIMILARS
 
 
+@pytest.mark.smoke
 def test_get_film_by_id(api_client):
     """Тест получения данных о фильме по ID"""
     response = api_client.get(f"/films/{Config.TEST_FILM_ID}")
     assert response.status_code == 200
-    data = response.json()
+    data = FILM.validate(response.json())
     assert data["kinopoiskId"] == Config.TEST_FILM_ID
     assert data["nameRu"] == "Триггер"
 
@@ -14,8 +19,7 @@ def test_get_series_seasons(api_client):
     """Тест получения данных о сезонах сериала"""
     response = api_client.get(f"/films/{Config.TEST_SERIES_ID}/seasons")
     assert response.status_code == 200
-    data = response.json()
-    assert "items" in data
+    data = SEASONS.validate(response.json())
     assert len(data["items"]) > 0
 
 
@@ -24,8 +28,7 @@ def test_get_film_awards(api_client):
     response = api_client.get(
         f"/films/{Config.TEST_FILM_WITH_AWARDS_ID}/awards")
     assert response.status_code == 200
-    data = response.json()
-    assert "items" in data
+    data = AWARDS.validate(response.json())
     assert len(data["items"]) > 0
 
 
@@ -34,22 +37,21 @@ def test_get_similar_films(api_client):
     response = api_client.get(
         f"/films/{Config.TEST_FILM_WITH_SIMILARS_ID}/similars")
     assert response.status_code == 200
-    data = response.json()
-    assert "items" in data
+    data = SIMILARS.validate(response.json())
     assert len(data["items"]) > 0
 
     def test_empty_film_request(api_client):
         """Тест поиска фильма с пустым запросом"""
     response = api_client.get("/films/")
     assert response.status_code == 400
-    assert "message" in response.json()
+    ERROR.validate(response.json())
 
 
 def test_empty_seasons_request(api_client):
     """Тест поиска сезонов с пустым ID"""
     response = api_client.get("/films/{}/seasons")
     assert response.status_code == 400
-    assert "message" in response.json()
+    ERROR.validate(response.json())
 
 
 def test_unsupported_post_method(api_client):
@@ -62,7 +64,7 @@ def test_empty_distributions_request(api_client):
     """Тест получения данных о прокате с пустым ID"""
     response = api_client.get("/films/{}/distributions")
     assert response.status_code == 400
-    assert "message" in response.json()
+    ERROR.validate(response.json())
 
 
 def test_future_premieres(api_client):
@@ -70,6 +72,31 @@ def test_future_premieres(api_client):
     response = api_client.get(
         "/films/premieres", params={"year": 2030, "month": "JANUARY"})
     assert response.status_code == 200
-    data = response.json()
+    data = PREMIERES.validate(response.json())
     assert data["total"] == 0
     assert data["items"] == []
+
+
+def test_films_catalogue(async_api_client):
+    """Тест получения данных о фильмах каталога одним пакетом"""
+    results = async_api_client.run_many(
+        "/films/{}", Config.CATALOGUE_FILM_IDS)
+    assert len(results) == len(Config.CATALOGUE_FILM_IDS)
+    for result in results:
+        assert result.error is None, f"{result.id}: {result.error}"
+        assert result.response.status_code == 200
+        data = FILM.validate(result.response.json())
+        assert data["kinopoiskId"] == result.id
+
+
+def test_catalogue_dataset(film_dataset, async_api_client):
+    """Тест данных о фильмах по внешнему набору (--dataset)"""
+    failures = []
+    for item, result in film_dataset.fetch(async_api_client):
+        problem = check_film(item, result)
+        if problem is not None:
+            failures.append(problem)
+        film_dataset.done(item)
+    assert not failures, (
+        f"Не совпало {len(failures)} из {film_dataset.processed}: "
+        + "; ".join(failures[:20]))
@@ -0,0 +1,24 @@
+import pytest
+
+from config import Config
+
+pytestmark = pytest.mark.benchmark
+
+# Эндпоинты, покрытые test_api.py: имя -> (путь, параметры)
+ENDPOINTS = {
+    "film": (f"/films/{Config.TEST_FILM_ID}", None),
+    "seasons": (f"/films/{Config.TEST_SERIES_ID}/seasons", None),
+    "awards": (f"/films/{Config.TEST_FILM_WITH_AWARDS_ID}/awards", None),
+    "similars": (f"/films/{Config.TEST_FILM_WITH_SIMILARS_ID}/similars", None),
+    "premieres": ("/films/premieres", {"year": 2030, "month": "JANUARY"}),
+}
+
+
+@pytest.mark.parametrize("name", list(ENDPOINTS))
+def test_endpoint_latency(api_benchmark, api_client, record_property, name):
+    """Тест задержки эндпоинта относительно базовой линии"""
+    endpoint, params = ENDPOINTS[name]
+    result = api_benchmark.run(
+        name, lambda: api_client.get(endpoint, params=params))
+    record_property("api_benchmark", result.report())
+    assert result.regression is None, result.regression
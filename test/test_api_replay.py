@@ -0,0 +1,78 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from api_client import APIClient
+from api_replay import ReplayServer, ResponseStore
+
+API_PATH = "/api/v2.2/"
+
+
+class _OriginHandler(BaseHTTPRequestHandler):
+    """Заменитель живого API: возвращает метод и путь запроса."""
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.dumps({
+            "method": self.command,
+            "path": self.path,
+            "data": json.loads(self.rfile.read(length) or "null"),
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def origin():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OriginHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    yield f"http://{host}:{port}{API_PATH}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_record_and_replay(tmp_path, origin):
+    """Тест записи ответов через APIClient и воспроизведения без сети"""
+    path = tmp_path / "records.sqlite3"
+    store = ResponseStore(path)
+    client = APIClient(origin, {})
+    client.session.hooks["response"].append(store.record)
+    recorded_get = client.get("films", params={"page": 2, "order": "YEAR"})
+    recorded_post = client.post("films/filters", data={"genre": 2})
+    client.close()
+    store.close()
+
+    store = ResponseStore(path)
+    assert len(store) == 2
+    server = ReplayServer(store).start()
+    client = APIClient(server.url + API_PATH, {})
+    try:
+        # Порядок параметров запроса не важен
+        replayed_get = client.get("films", params={"order": "YEAR", "page": 2})
+        replayed_post = client.post("films/filters", data={"genre": 2})
+        missing = client.get("films/1")
+    finally:
+        client.close()
+        server.stop()
+        store.close()
+
+    assert replayed_get.status_code == 200
+    assert replayed_get.json() == recorded_get.json()
+    assert replayed_post.json() == recorded_post.json()
+    assert replayed_post.json()["method"] == "POST"
+    assert missing.status_code == 404
+    assert "Ответ не записан" in missing.json()["message"]
+    # После закрытия WAL перенесен в основной файл
+    assert sorted(item.name for item in tmp_path.iterdir()) == [
+        "records.sqlite3"]
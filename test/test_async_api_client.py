@@ -0,0 +1,78 @@
+import threading
+import time
+
+from async_api_client import AsyncAPIClient
+
+
+class _FakeClient:
+    """Клиент с задержкой ответа и счетчиком одновременных запросов."""
+
+    def __init__(self, delay=0.05, failing=()):
+        self.delay = delay
+        self.failing = set(failing)
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get(self, endpoint, params=None):
+        with self._lock:
+            self.calls.append(endpoint)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if endpoint in self.failing:
+                raise ConnectionError(endpoint)
+            return f"ok {endpoint}"
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_concurrency_limit():
+    """Тест числа одновременных запросов и предела размером пула"""
+    client = _FakeClient()
+    async_client = AsyncAPIClient(client, concurrency=4)
+    try:
+        async_client.run_many("films/{}", range(12), concurrency=2)
+        assert client.peak == 2
+        client.peak = 0
+        async_client.run_many("films/{}", range(12), concurrency=10)
+        assert client.peak == 4
+    finally:
+        async_client.close()
+
+
+def test_errors_are_captured():
+    """Тест ошибки запроса в BatchResult без остановки пакета"""
+    client = _FakeClient(failing={"films/3"})
+    async_client = AsyncAPIClient(client, concurrency=4)
+    try:
+        results = {
+            result.id: result
+            for result in async_client.run_many("films/{}", range(6))}
+    finally:
+        async_client.close()
+    assert sorted(results) == list(range(6))
+    assert isinstance(results[3].error, ConnectionError)
+    assert results[3].response is None
+    assert results[0].response == "ok films/0" and results[0].error is None
+
+
+def test_early_stop_cancels_pending():
+    """Тест отмены оставшихся запросов, когда потребитель остановился"""
+    client = _FakeClient()
+    async_client = AsyncAPIClient(client, concurrency=4)
+    try:
+        results = async_client.iter_many("films/{}", range(1000))
+        first = [next(results) for _ in range(2)]
+        results.close()
+        calls = len(client.calls)
+        time.sleep(0.2)
+    finally:
+        async_client.close()
+    assert len(first) == 2
+    # Запущены только первые запросы, после остановки новых нет
+    assert calls <= 8
+    assert len(client.calls) == calls
@@ -0,0 +1,83 @@
+import pytest
+
+import browser_daemon
+from browser_daemon import WarmPool
+
+PROFILE = {"block_resources": None}
+
+
+class _FakeDriver:
+    """Драйвер без браузера: учет закрытия и результат очистки"""
+
+    def __init__(self, browser, profile):
+        self.browser = browser
+        self.profile = profile
+        self.healthy = True
+        self.closed = False
+
+    def quit(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(browser_daemon, "_reset",
+                        lambda driver: driver.healthy)
+    pool = WarmPool(_FakeDriver, max_size=2)
+    yield pool
+    pool.close()
+
+
+def test_reuse_same_profile(pool):
+    """Тест повторной выдачи очищенного браузера с теми же настройками"""
+    first = pool.acquire("chrome", PROFILE)
+    pool.release(first)
+    second = pool.acquire("chrome", PROFILE)
+    assert second is first
+    assert second.uses == 2
+    assert pool.status()["counters"] == {
+        "launched": 1, "leases": 2, "reused": 1}
+
+
+def test_acquire_when_full(pool):
+    """Тест отказа, если все браузеры заняты и ждать нельзя"""
+    pool.acquire("chrome", PROFILE)
+    pool.acquire("firefox", PROFILE)
+    assert pool.acquire("chrome", PROFILE, wait=0) is None
+    assert pool.counters["timeouts"] == 1
+    assert len(pool.browsers) == 2
+
+
+def test_evict_other_profile(pool):
+    """Тест замены простаивающего браузера с другими настройками"""
+    old = pool.acquire("chrome", PROFILE)
+    pool.release(old)
+    pool.acquire("firefox", PROFILE)
+    blocking = pool.acquire("chrome", {"block_resources": "image"})
+    assert old.driver.closed
+    assert old not in pool.browsers
+    assert blocking.driver.profile == {"block_resources": "image"}
+    assert pool.counters["evicted"] == 1
+
+
+def test_discard_unhealthy(pool):
+    """Тест закрытия браузера, который не удалось очистить"""
+    warm = pool.acquire("chrome", PROFILE)
+    warm.driver.healthy = False
+    pool.release(warm)
+    assert warm.driver.closed
+    assert pool.browsers == []
+
+
+def test_idle_expiry(pool):
+    """Тест выгрузки простаивающих браузеров; занятые остаются"""
+    pool.idle_timeout = 0
+    idle = pool.acquire("chrome", PROFILE)
+    pool.release(idle)
+    busy = pool.acquire("firefox", PROFILE)
+    pool.evict_idle()
+    assert idle.driver.closed
+    assert pool.browsers == [busy]
+    status = pool.status()
+    assert status["counters"]["expired"] == 1
+    assert [item["state"] for item in status["browsers"]] == ["busy"]
@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+import pytest
+
+from browser_matrix import BrowserMatrixReport, parse_browsers
+
+
+class _Terminal:
+    def __init__(self):
+        self.lines = []
+
+    def write_sep(self, sep, title):
+        self.lines.append(title)
+
+    def write_line(self, line):
+        self.lines.append(line)
+
+
+def _report(nodeid, when, outcome, browser, duration=1.0):
+    return SimpleNamespace(
+        nodeid=nodeid, when=when, outcome=outcome,
+        passed=outcome == "passed", duration=duration,
+        user_properties=[("browser", browser)] if browser else [])
+
+
+def test_parse_browsers():
+    """Тест разбора списка браузеров матрицы"""
+    assert parse_browsers(" Chrome,firefox,chrome ") == ["chrome", "firefox"]
+    with pytest.raises(pytest.UsageError):
+        parse_browsers("chrome,safari")
+
+
+def test_matrix_rows_by_browser():
+    """Тест строк матрицы: незапущенный браузер и браузер без тестов"""
+    report = BrowserMatrixReport(["chrome", "firefox", "edge"])
+    for phase in ("setup", "call", "teardown"):
+        report.pytest_runtest_logreport(
+            _report("t[chrome]", phase, "passed", "chrome"))
+    # Firefox не запустился: skip в setup, без фазы call
+    report.pytest_runtest_logreport(
+        _report("t[firefox]", "setup", "skipped", "firefox", 0.2))
+    report.pytest_runtest_logreport(
+        _report("t[firefox]", "teardown", "passed", "firefox", 0.0))
+    # Тест без браузера в сводку не попадает
+    report.pytest_runtest_logreport(_report("api", "call", "passed", None))
+
+    terminal = _Terminal()
+    report.pytest_terminal_summary(terminal)
+    rows = {line.split()[0]: line.split()[1:] for line in terminal.lines[2:]}
+    assert rows["chrome"] == ["1", "1", "0", "0", "3.0", "3.0", "3.0"]
+    assert rows["firefox"] == ["1", "0", "0", "1", "0.2", "0.2", "0.2"]
+    assert rows["edge"] == ["0"]
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from catalogue_dataset import FilmDataset
+
+
+def _csv(tmp_path, count, bom=False):
+    lines = ["kinopoiskId,year"]
+    lines += [f"{film_id},{2000 + film_id}" for film_id in range(count)]
+    path = tmp_path / "films.csv"
+    path.write_text("\n".join(lines) + "\n",
+                    encoding="utf-8-sig" if bom else "utf-8")
+    return path
+
+
+def _jsonl(tmp_path, count):
+    path = tmp_path / "films.jsonl"
+    path.write_text("".join(
+        json.dumps({"kinopoiskId": film_id, "nameRu": f"Фильм {film_id}"},
+                   ensure_ascii=False) + "\n"
+        for film_id in range(count)), encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("bom", [False, True], ids=["csv", "csv-bom"])
+def test_csv_rows(tmp_path, bom):
+    """Тест чтения CSV, в том числе с BOM из Excel"""
+    rows = list(FilmDataset(_csv(tmp_path, 3, bom)).rows())
+    assert [row.id for row in rows] == [0, 1, 2]
+    assert rows[1].expected == {"year": "2001"}
+
+
+def test_jsonl_rows(tmp_path):
+    """Тест чтения JSONL"""
+    rows = list(FilmDataset(_jsonl(tmp_path, 2)).rows())
+    assert [row.id for row in rows] == [0, 1]
+    assert rows[1].expected == {"nameRu": "Фильм 1"}
+
+
+def test_shards_split_rows(tmp_path):
+    """Тест разбиения набора на шарды без пересечений и пропусков"""
+    path = _csv(tmp_path, 10)
+    shards = [{row.id for row in FilmDataset(path, shard=shard,
+                                             shards=3).rows()}
+              for shard in range(3)]
+    assert set().union(*shards) == set(range(10))
+    assert sum(len(ids) for ids in shards) == 10
+    assert shards[1] == {1, 4, 7}
+
+
+def test_sample_is_deterministic(tmp_path):
+    """Тест выборки: доля строк и повторяемость при том же seed"""
+    path = _csv(tmp_path, 1000)
+
+    def sample(seed):
+        return [row.id for row in FilmDataset(path, sample=0.2,
+                                              seed=seed).rows()]
+
+    assert 150 < len(sample(1)) < 250
+    assert sample(1) == sample(1)
+    assert sample(1) != sample(2)
+
+
+def test_done_out_of_order(tmp_path):
+    """Тест контрольной точки: сдвиг только по обработанным подряд строкам"""
+    dataset = FilmDataset(_csv(tmp_path, 4))
+    first, second, third, _ = dataset.rows()
+    dataset.done(second)
+    dataset.done(third)
+    assert dataset.position == {"offset": 0, "row": 0}
+    dataset.done(first)
+    assert dataset.position == {"offset": third.end, "row": 3}
+    assert dataset.processed == 3
+
+
+def test_resume_from_position(tmp_path):
+    """Тест продолжения прерванного прогона с сохраненной позиции"""
+    path = _csv(tmp_path, 5)
+    dataset = FilmDataset(path)
+    rows = dataset.rows()
+    for _ in range(2):
+        dataset.done(next(rows))
+    rows.close()
+
+    resumed = FilmDataset(path)
+    resumed.resume(dataset.position)
+    assert [row.id for row in resumed.rows()] == [2, 3, 4]
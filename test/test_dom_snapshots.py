@@ -0,0 +1,63 @@
+import pytest
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+from dom_snapshots import HIDDEN_ATTRIBUTE, OfflineDriver, SnapshotStore
+
+BASE_URL = "https://www.kinopoisk.ru/"
+
+PAGE = f"""<!DOCTYPE html>
+<html><head><title>Поиск — Кинопоиск</title>
+<style>.film {{ color: red }}</style></head>
+<body>
+  <h1>Результаты   поиска</h1>
+  <div class="results">
+    <a class="film" href="/film/1100777/">Триггер</a>
+    <script>window.counter = 1;</script>
+  </div>
+  <div class="popup" {HIDDEN_ATTRIBUTE}>
+    <p class="hint">Войдите, чтобы <b>оценить</b></p>
+  </div>
+  <p class="footer">© Кинопоиск</p>
+</body></html>
+"""
+
+
+@pytest.fixture
+def offline_driver(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.save(BASE_URL + "index/films/?kp_query=x", "Поиск", PAGE)
+    driver = OfflineDriver(store, BASE_URL)
+    driver.get(BASE_URL + "index/films/?kp_query=x")
+    return driver
+
+
+def test_hidden_ancestor(offline_driver):
+    """Тест видимости элемента внутри скрытого поддерева"""
+    hint = offline_driver.find_element(By.CSS_SELECTOR, ".popup .hint")
+    assert not hint.is_displayed()
+    assert offline_driver.find_element(By.CLASS_NAME, "film").is_displayed()
+
+
+def test_xpath_contains_text(offline_driver):
+    """Тест XPath-локатора с contains(text(), ...)"""
+    film = offline_driver.find_element(
+        By.XPATH, "//a[contains(text(), 'Триггер')]")
+    assert film.get_attribute("href") == "/film/1100777/"
+    assert offline_driver.find_elements(
+        By.XPATH, "//a[contains(text(), 'Интерстеллар')]") == []
+
+
+def test_inner_text_approximation(offline_driver):
+    """Тест текста страницы без скрытых узлов, скриптов и лишних пробелов"""
+    page = offline_driver.document.page()
+    assert page["title"] == "Поиск — Кинопоиск"
+    assert page["text"] == "Результаты поиска Триггер © Кинопоиск"
+    results = offline_driver.find_element(By.CLASS_NAME, "results")
+    assert results.text == "Триггер"
+
+
+def test_screenshot_is_webdriver_error(offline_driver):
+    """Тест отказа в скриншоте исключением WebDriver"""
+    with pytest.raises(WebDriverException):
+        offline_driver.get_screenshot_as_png()
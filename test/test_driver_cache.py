@@ -0,0 +1,62 @@
+import json
+
+import pytest
+from webdriver_manager.core.os_manager import OperationSystemManager
+
+import driver_cache
+from driver_cache import DriverManifest
+
+
+@pytest.fixture
+def browser_lookup(monkeypatch):
+    """Подмена определения версии браузера: список вызовов и версия."""
+    monkeypatch.setattr(driver_cache, "_versions", {})
+    monkeypatch.setattr(driver_cache, "_resolved", {})
+    lookup = {"calls": 0, "version": "120.0.1"}
+
+    def version_from_os(self, browser_type):
+        lookup["calls"] += 1
+        return lookup["version"]
+
+    monkeypatch.setattr(
+        OperationSystemManager, "get_browser_version_from_os",
+        version_from_os)
+    return lookup
+
+
+def _manager(path):
+    installs = []
+
+    class Manager:
+        def install(self):
+            installs.append(path)
+            return str(path)
+
+    return Manager, installs
+
+
+def test_version_lookup_once_per_process(tmp_path, browser_lookup):
+    """Тест одного определения версии браузера на процесс"""
+    driver = tmp_path / "chromedriver"
+    driver.touch()
+    manager, installs = _manager(driver)
+    manifest = DriverManifest(tmp_path / "manifest.json")
+    for _ in range(3):
+        assert manifest.resolve("chrome", manager) == str(driver)
+    assert browser_lookup["calls"] == 1
+    assert len(installs) == 1
+    assert json.loads((tmp_path / "manifest.json").read_text()) == {
+        "chrome": {"120.0.1": str(driver)}}
+
+
+def test_unknown_version_not_persisted(tmp_path, browser_lookup):
+    """Тест: без версии браузера манифест не читается и не пишется"""
+    browser_lookup["version"] = None
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps({"chrome": {"unknown": "/old/chromedriver"}}))
+    manager, installs = _manager(tmp_path / "chromedriver")
+    assert DriverManifest(path).resolve("chrome", manager) == str(
+        tmp_path / "chromedriver")
+    assert len(installs) == 1
+    assert json.loads(path.read_text()) == {
+        "chrome": {"unknown": "/old/chromedriver"}}
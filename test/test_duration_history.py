@@ -0,0 +1,75 @@
+import pytest
+
+from duration_history import assign_engines, pick, predict_makespan
+
+# Тест: (оценка, браузер); None - тест без браузера
+TESTS = {
+    "ui_chrome_long": (8.0, "chrome"),
+    "ui_chrome": (4.0, "chrome"),
+    "ui_firefox": (3.0, "firefox"),
+    "ui_edge": (2.0, "edge"),
+    "api": (1.0, None),
+    "api_slow": (18.0, None),
+}
+
+
+def _split(names):
+    estimates = {name: TESTS[name][0] for name in names}
+    engines = {name: TESTS[name][1] for name in names}
+    return estimates, engines
+
+
+@pytest.mark.parametrize("names, workers, expected", [
+    # Браузеров больше, чем воркеров: по одному самым долгим
+    (["ui_chrome_long", "ui_chrome", "ui_firefox", "ui_edge", "api"], 2,
+     ["chrome", "firefox"]),
+    # Доля chrome 12 из 18 с при трех воркерах - два воркера
+    (["ui_chrome_long", "ui_chrome", "ui_firefox", "api"], 3,
+     ["chrome", "chrome", "firefox"]),
+    # Малая доля округляется вверх до одного воркера
+    (["ui_edge", "api_slow"], 4, ["edge", None, None, None]),
+    # Только тесты без браузера
+    (["api"], 3, [None, None, None]),
+], ids=["more-engines-than-workers", "share", "min-one", "no-browsers"])
+def test_assign_engines(names, workers, expected):
+    """Тест распределения воркеров по браузерам"""
+    estimates, engines = _split(names)
+    assert assign_engines(estimates, engines, workers) == expected
+
+
+@pytest.mark.parametrize("pending, engine, orphans, expected", [
+    # Воркер браузера берет свой тест раньше теста без браузера
+    (["api", "ui_chrome"], "chrome", (), "ui_chrome"),
+    # Своих тестов нет - тест без браузера
+    (["ui_firefox", "api"], "chrome", (), "api"),
+    # Чужой браузер не берет
+    (["ui_firefox"], "chrome", (), None),
+    # Воркер без браузера берет только тесты без браузера
+    (["ui_chrome", "api"], None, (), "api"),
+    (["ui_chrome"], None, (), None),
+    # Браузер без своих воркеров может взять любой
+    (["ui_edge", "api"], None, {"edge"}, "ui_edge"),
+    (["ui_edge"], "chrome", {"edge"}, "ui_edge"),
+], ids=["own-engine-first", "fallback", "foreign-engine", "none-worker",
+        "none-worker-idle", "orphan-to-none-worker",
+        "orphan-to-engine-worker"])
+def test_pick(pending, engine, orphans, expected):
+    """Тест выбора следующего теста для воркера"""
+    engines = {name: browser for name, (_, browser) in TESTS.items()}
+    assert pick(pending, engine, engines.get, orphans) == expected
+
+
+@pytest.mark.parametrize("names, assignment, expected", [
+    # Тесты chrome идут подряд на своем воркере: 8 + 4
+    (["ui_chrome_long", "ui_chrome", "api"], ["chrome", None], 12.0),
+    # Два воркера chrome делят его тесты
+    (["ui_chrome_long", "ui_chrome", "api"], ["chrome", "chrome"], 8.0),
+    # Edge без воркера выполняет освободившийся воркер без браузера
+    (["ui_edge", "api"], [None], 3.0),
+    # Воркеры только без браузера, тестов без браузера нет - сирота
+    (["ui_firefox"], [None, None], 3.0),
+], ids=["pinned", "shared-engine", "orphan", "none-only-workers"])
+def test_predict_makespan(names, assignment, expected):
+    """Тест прогноза длительности прогона"""
+    estimates, engines = _split(names)
+    assert predict_makespan(estimates, engines, assignment) == expected
@@ -0,0 +1,86 @@
+import subprocess
+import sys
+import time
+from email.utils import formatdate
+from pathlib import Path
+from types import SimpleNamespace
+
+from rate_limit import RateLimiter, retry_after_seconds
+
+# Процесс ждет токен в своей полосе и дописывает ее имя в журнал
+WAITER = """
+import sys
+from rate_limit import RateLimiter
+state, lane, journal = sys.argv[1:]
+RateLimiter(state, rate=1, burst=1).acquire(lane)
+with open(journal, "a") as output:
+    output.write(lane + "\\n")
+"""
+
+
+def _limiter(tmp_path, rate, burst):
+    limiter = RateLimiter(tmp_path / "state.json", rate, burst=burst)
+    limiter.reset()
+    return limiter
+
+
+def _response(retry_after=None):
+    headers = {} if retry_after is None else {"Retry-After": retry_after}
+    return SimpleNamespace(headers=headers)
+
+
+def test_burst_then_refill_rate(tmp_path):
+    """Тест выдачи запаса токенов без ожидания и пополнения по частоте"""
+    limiter = _limiter(tmp_path, rate=10, burst=3)
+    time.sleep(0.3)  # запас не растет выше burst
+    started = time.perf_counter()
+    for _ in range(3):
+        limiter.acquire()
+    assert time.perf_counter() - started < 0.05
+    limiter.acquire()
+    assert time.perf_counter() - started >= 0.08
+    stats = limiter.stats()
+    assert stats["requests"] == 4
+    assert stats["throttled"] == 1
+
+
+def test_block_pauses_after_429(tmp_path):
+    """Тест паузы всех запросов после ответа 429"""
+    limiter = _limiter(tmp_path, rate=100, burst=5)
+    limiter.block(0.3)
+    started = time.perf_counter()
+    limiter.acquire()
+    assert time.perf_counter() - started >= 0.28
+    assert limiter.stats()["rate_limited"] == 1
+
+
+def test_priority_lane_goes_first(tmp_path):
+    """Тест очередности полос: smoke получает токен раньше bulk"""
+    limiter = _limiter(tmp_path, rate=1, burst=1)
+    limiter.acquire()
+    journal = tmp_path / "journal.txt"
+
+    def wait(lane):
+        return subprocess.Popen(
+            [sys.executable, "-c", WAITER, str(limiter.path), lane,
+             str(journal)],
+            cwd=Path(__file__).parent)
+
+    bulk = wait("bulk")
+    time.sleep(0.2)
+    smoke = wait("smoke")
+    assert bulk.wait(timeout=10) == 0
+    assert smoke.wait(timeout=10) == 0
+    assert journal.read_text().split() == ["smoke", "bulk"]
+
+
+def test_retry_after_seconds():
+    """Тест разбора Retry-After: секунды, HTTP-дата, отсутствие, мусор"""
+    assert retry_after_seconds(_response("2.5")) == 2.5
+    assert retry_after_seconds(_response("-3")) == 0.0
+    in_30s = formatdate(time.time() + 30, usegmt=True)
+    assert 28 <= retry_after_seconds(_response(in_30s)) <= 30
+    past = formatdate(time.time() - 60, usegmt=True)
+    assert retry_after_seconds(_response(past)) == 0.0
+    assert retry_after_seconds(_response(), default=4) == 4
+    assert retry_after_seconds(_response("soon"), default=4) == 4
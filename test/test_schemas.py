@@ -0,0 +1,68 @@
+import copy
+import time
+
+import pytest
+
+from schemas import FILM, SEASONS
+
+# Бюджет проверки одного ответа: на порядки меньше сетевого запроса
+VALIDATION_BUDGET_US = 20
+CATALOGUE_SIZE = 100_000
+
+FILM_SAMPLE = {
+    "kinopoiskId": 1100777,
+    "imdbId": "tt9018736",
+    "nameRu": "Триггер",
+    "nameEn": None,
+    "nameOriginal": None,
+    "posterUrl": "https://kinopoiskapiunofficial.tech/images/posters/kp/"
+                 "1100777.jpg",
+    "posterUrlPreview": "https://kinopoiskapiunofficial.tech/images/"
+                        "posters/kp_small/1100777.jpg",
+    "ratingKinopoisk": 7.6,
+    "ratingKinopoiskVoteCount": 95000,
+    "ratingImdb": 7,
+    "ratingImdbVoteCount": 1200,
+    "webUrl": "https://www.kinopoisk.ru/film/1100777/",
+    "year": 2018,
+    "filmLength": 52,
+    "description": "Психолог провоцирует пациентов",
+    "type": "TV_SERIES",
+    "countries": [{"country": "Россия"}],
+    "genres": [{"genre": "драма"}, {"genre": "триллер"}],
+    "serial": True,
+}
+
+
+def test_valid_film_has_no_errors():
+    """Тест прохождения валидного ответа о фильме"""
+    assert FILM.errors(FILM_SAMPLE) == []
+
+
+def test_errors_contain_json_path():
+    """Тест JSON-путей в ошибках схемы"""
+    film = copy.deepcopy(FILM_SAMPLE)
+    film["genres"][1]["genre"] = 5
+    film["kinopoiskId"] = True
+    del film["webUrl"]
+    assert FILM.errors(film) == [
+        "$.kinopoiskId: ожидался int, получен True",
+        "$.webUrl: отсутствует",
+        "$.genres[1].genre: ожидался str, получен 5",
+    ]
+    assert SEASONS.errors({"total": 1, "items": [{"number": 1}]}) == [
+        "$.items[0].episodes: отсутствует",
+    ]
+
+
+@pytest.mark.benchmark
+def test_validation_cost_at_catalogue_scale():
+    """Тест стоимости проверки схемы на объеме каталога"""
+    films = [FILM_SAMPLE] * CATALOGUE_SIZE
+    started = time.perf_counter()
+    for film in films:
+        FILM.check(film)
+    per_response = (time.perf_counter() - started) / CATALOGUE_SIZE * 1e6
+    assert per_response < VALIDATION_BUDGET_US, (
+        f"Проверка ответа заняла {per_response:.1f} мкс, "
+        f"бюджет {VALIDATION_BUDGET_US} мкс")
@@ -0,0 +1,42 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# Бюджет на импорт плагинов сверх pytest и requests, секунды
+IMPORT_BUDGET = 0.15
+
+HEAVY_MODULES = ("selenium", "webdriver_manager", "allure")
+
+COLD_START = """
+import json, sys, time
+import pytest, requests
+started = time.perf_counter()
+import api_plugin, ui_plugin, scheduling_plugin
+elapsed = time.perf_counter() - started
+heavy = sorted({m.split(".")[0] for m in sys.modules} & set(sys.argv[1:]))
+print(json.dumps({"elapsed": elapsed, "heavy": heavy}))
+"""
+
+
+def _cold_start():
+    """Импорт плагинов в чистом интерпретаторе."""
+    output = subprocess.run(
+        [sys.executable, "-c", COLD_START, *HEAVY_MODULES],
+        cwd=Path(__file__).parent, capture_output=True, text=True,
+        check=True,
+    ).stdout
+    return json.loads(output)
+
+
+def test_api_session_does_not_import_browser_stack():
+    """Тест отсутствия Selenium при загрузке плагинов"""
+    result = _cold_start()
+    assert result["heavy"] == [], f"Загружены при старте: {result['heavy']}"
+
+
+def test_plugins_import_time():
+    """Тест времени холодного старта плагинов"""
+    elapsed = min(_cold_start()["elapsed"] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET, (
+        f"Импорт плагинов занял {elapsed:.3f} с, бюджет {IMPORT_BUDGET} с")
@@ -0,0 +1,71 @@
+import pytest
+
+from pages import SNAPSHOT_SCRIPT, BasePage
+from waits import WaitEngine, match_block
+
+
+@pytest.mark.parametrize("page, category", [
+    ({"title": "(500) дней лета (2009) — Кинопоиск", "status": 200}, None),
+    ({"title": "Кинопоиск", "status": 503}, "server_error"),
+    ({"title": "502 Bad Gateway"}, "server_error"),
+    ({"title": "Ошибка 500"}, "server_error"),
+    ({"url": "https://www.kinopoisk.ru/showcaptcha?retpath=x"}, "captcha"),
+    ({"title": "403 Forbidden"}, "blocked"),
+], ids=["film-title", "status", "bad-gateway", "error-title", "captcha",
+        "blocked"])
+def test_match_block(page, category):
+    """Тест распознавания капчи, блокировки и страниц ошибок"""
+    block = match_block(page)
+    assert (block and block.category) == category
+
+
+class _FlakyDriver:
+    """Драйвер, отдающий страницу с кодом из statuses по одному на загрузку"""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.refreshes = 0
+
+    def refresh(self):
+        self.refreshes += 1
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def execute_script(self, script, *args):
+        index = min(self.refreshes, len(self.statuses) - 1)
+        page = {"url": "https://www.kinopoisk.ru/", "title": "Кинопоиск",
+                "text": "", "status": self.statuses[index]}
+        if script == SNAPSHOT_SCRIPT:
+            page["elements"] = {}
+        return page
+
+
+@pytest.mark.parametrize("statuses, refreshes", [
+    ([200], 0),
+    ([503, 502, 200], 2),
+], ids=["ok", "recovered"])
+def test_check_page_retries_server_error(statuses, refreshes):
+    """Тест перезагрузки страницы с ошибкой сервера при открытии"""
+    driver = _FlakyDriver(statuses)
+    WaitEngine(driver, interval=0).check_page()
+    assert driver.refreshes == refreshes
+
+
+def test_check_page_aborts_after_retries():
+    """Тест падения теста, если ошибка сервера не проходит"""
+    driver = _FlakyDriver([503])
+    with pytest.raises(pytest.fail.Exception, match="server_error"):
+        WaitEngine(driver, interval=0, retries=2).check_page()
+    assert driver.refreshes == 2
+
+
+def test_snapshot_detects_server_error():
+    """Тест распознавания ошибки сервера по коду в снимке page-объекта"""
+    driver = _FlakyDriver([503, 200])
+
+    def loaded(snapshot):
+        return snapshot.data["status"] == 200
+
+    BasePage(driver).wait_snapshot({}, loaded)
+    assert driver.refreshes == 1
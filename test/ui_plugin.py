@@ -0,0 +1,368 @@
+"""Плагин pytest с фикстурами для UI тестов.
+
+Selenium и webdriver_manager импортируются только при первом запросе
+фикстуры driver, поэтому запуск одних API тестов их не загружает.
+"""
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from browser_matrix import BrowserMatrixReport, parse_browsers
+from browser_pool import BrowserPool
+from perf_metrics import PerfRecorder
+from profiler import ProfileReport
+from screenshots import ScreenshotService
+from resource_blocking import (
+    DEFAULT_TYPES,
+    RESOURCE_PATTERNS,
+    ResourceReport,
+)
+
+
+def pytest_addoption(parser):
+    """Добавляем опции для выбора браузера."""
+    parser.addoption(
+        "--browser", action="store", default="chrome",
+        help="Браузер для тестов: chrome, firefox, edge; несколько через "
+             "запятую - матрица, каждый UI тест в каждом браузере"
+    )
+    parser.addoption(
+        "--headless", action="store_true", help="Запуск в headless режиме"
+    )
+    parser.addoption(
+        "--url", action="store", default="https://www.kinopoisk.ru/",
+        help="URL для тестирования"
+    )
+    parser.addoption(
+        "--driver-scope", action="store", default="function",
+        choices=["function", "worker"],
+        help="function - новый браузер на каждый тест, worker - один "
+             "переиспользуемый браузер на xdist-воркер"
+    )
+    parser.addoption(
+        "--browser-daemon", action="store", nargs="?", const="",
+        default=None, metavar="SOCKET",
+        help="Брать headless-браузеры у демона test/browser_daemon.py "
+             "(по умолчанию его сокет во временном каталоге); без демона "
+             "браузер запускается как обычно"
+    )
+    parser.addoption(
+        "--driver-max-uses", action="store", type=int, default=20,
+        help="Через сколько тестов пересоздавать браузер в режиме worker"
+    )
+    parser.addoption(
+        "--block-resources", action="store", nargs="?", const=DEFAULT_TYPES,
+        default=None,
+        help="Блокировать ресурсы страниц, через запятую: "
+             f"{', '.join(RESOURCE_PATTERNS)} (по умолчанию {DEFAULT_TYPES}); "
+             "none - только собрать статистику для сравнения"
+    )
+    parser.addoption(
+        "--block-url", action="append", default=[],
+        help="Дополнительный URL-шаблон для блокировки, например *ads*"
+    )
+    parser.addoption(
+        "--page-load-strategy", action="store", default="normal",
+        choices=["normal", "eager", "none"],
+        help="Стратегия загрузки страниц Selenium"
+    )
+    parser.addoption(
+        "--screenshot-format", action="store", default="jpeg",
+        choices=["png", "jpeg", "webp"],
+        help="Формат скриншотов при падении тестов"
+    )
+    parser.addoption(
+        "--screenshot-max-width", action="store", type=int, default=1280,
+        help="Максимальная ширина скриншота, пикселей"
+    )
+    parser.addoption(
+        "--screenshot-quality", action="store", type=int, default=70,
+        help="Качество JPEG/WebP скриншотов"
+    )
+    parser.addoption(
+        "--screenshot-budget-mb", action="store", type=int, default=50,
+        help="Общий лимит объема скриншотов за запуск, МБ"
+    )
+    parser.addoption(
+        "--perf-metrics", action="store_true",
+        help="Снимать метрики производительности при каждом открытии "
+             "страницы (для тестов с perf_budget - всегда)"
+    )
+    parser.addoption(
+        "--perf-history", action="store",
+        default=str(Path(__file__).parent / "data" / "perf_history.jsonl"),
+        help="Файл временного ряда метрик страниц (JSON Lines)"
+    )
+    parser.addoption(
+        "--webdriver-profile", action="store", default=None,
+        metavar="PATH",
+        help="Профилировать команды WebDriver и сохранить профили тестов "
+             "в JSON-файл PATH (и в Allure)"
+    )
+    parser.addoption(
+        "--dom-snapshots", action="store", default="off",
+        choices=["off", "record", "replay"],
+        help="record - сохранять DOM страниц при прогоне в браузере, "
+             "replay - выполнять UI тесты над сохраненными снимками "
+             "без браузера"
+    )
+    parser.addoption(
+        "--dom-snapshot-dir", action="store",
+        default=str(Path(__file__).parent / "data" / "dom_snapshots"),
+        help="Каталог снимков DOM"
+    )
+
+
+def pytest_generate_tests(metafunc):
+    """Матрица --browser=chrome,firefox: тест на каждый браузер.
+
+    Тесты одного браузера объединены в xdist_group, поэтому с
+    --dist loadgroup каждый браузер работает на своем воркере.
+    """
+    if "driver" not in metafunc.fixturenames:
+        return
+    browsers = parse_browsers(metafunc.config.getoption("--browser"))
+    if len(browsers) > 1:
+        metafunc.parametrize("browser_name", [
+            pytest.param(name, marks=pytest.mark.xdist_group(name), id=name)
+            for name in browsers
+        ])
+
+
+@pytest.fixture
+def browser_name(request):
+    """Браузер теста: из --browser или из параметра матрицы."""
+    return parse_browsers(request.config.getoption("--browser"))[0]
+
+
+@pytest.fixture(scope="session")
+def browser_pool(request):
+    """«Теплые» браузеры xdist-воркера: {имя браузера: BrowserPool}.
+
+    Пул браузера создается при первом его тесте на воркере. Используется
+    при --driver-scope=worker, иначе None.
+    """
+    if request.config.getoption("--driver-scope") != "worker":
+        yield None
+        return
+
+    pools = {}
+    yield pools
+    for pool in pools.values():
+        pool.close()
+
+
+@pytest.fixture(scope="function")
+def driver(request, browser_pool, browser_name):
+    """Универсальная фикстура для инициализации браузера."""
+    config = request.config
+    if config.getoption("--dom-snapshots") == "replay":
+        yield _offline_driver(config)
+        return
+
+    started = time.perf_counter()
+    lease = _lease_driver(config, browser_name)
+    if lease is not None:
+        _start_test(request, lease.driver, time.perf_counter() - started,
+                    browser_name)
+        yield lease.driver
+        _collect_resource_stats(request, lease.driver)
+        lease.release()
+        return
+
+    if browser_pool is not None:
+        pool = browser_pool.get(browser_name)
+        if pool is None:
+            pool = browser_pool[browser_name] = BrowserPool(
+                lambda: _create_driver(config, browser_name),
+                max_uses=config.getoption("--driver-max-uses"),
+            )
+        driver = pool.acquire()
+        _start_test(request, driver, time.perf_counter() - started,
+                    browser_name)
+        yield driver
+        _collect_resource_stats(request, driver)
+        pool.release(driver)
+        return
+
+    driver = _create_driver(config, browser_name)
+    _start_test(request, driver, time.perf_counter() - started,
+                browser_name)
+
+    yield driver
+
+    _collect_resource_stats(request, driver)
+
+    # Закрываем браузер
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def _create_driver(config, browser_name):
+    """Запуск браузера с отложенным импортом Selenium."""
+    from browsers import create_driver
+
+    return create_driver(config, browser_name)
+
+
+def _lease_driver(config, browser_name):
+    """Браузер демона или None: демон не запущен или весь пул занят."""
+    path = config.getoption("--browser-daemon")
+    if path is None:
+        return None
+
+    from browser_daemon import DaemonClient, DaemonError
+    from browsers import attach_driver, launch_profile
+
+    try:
+        # Пустой путь - сокет демона по умолчанию
+        lease = DaemonClient(path or None).lease(
+            browser_name, launch_profile(config))
+    except OSError as e:
+        print(f"Демон браузеров недоступен ({e}), запускаем браузер")
+        return None
+    except DaemonError as e:
+        pytest.skip(f"Не удалось инициализировать {browser_name}: {e}")
+    if lease is None:
+        print("Все браузеры демона заняты, запускаем браузер")
+        return None
+    try:
+        lease.driver = attach_driver(config, lease.info)
+    except Exception:
+        lease.discard()
+        raise
+    return lease
+
+
+def _offline_driver(config):
+    """Драйвер над сохраненными снимками DOM вместо браузера."""
+    from dom_snapshots import OfflineDriver, SnapshotStore
+
+    return OfflineDriver(
+        SnapshotStore(config.getoption("--dom-snapshot-dir")),
+        config.getoption("--url"))
+
+
+def _start_test(request, driver, launch, browser_name):
+    """Сброс статистики ресурсов, профиля и метрик страниц перед тестом."""
+    blocker = getattr(driver, "resource_blocker", None)
+    if blocker is not None:
+        blocker.start(driver)
+    profiler = getattr(driver, "profiler", None)
+    if profiler is not None:
+        profiler.start(launch)
+
+    config = request.config
+    if len(parse_browsers(config.getoption("--browser"))) > 1:
+        import allure
+
+        allure.dynamic.parent_suite(browser_name)
+    driver.perf_recorder = None
+    if (config.getoption("--perf-metrics")
+            or request.node.get_closest_marker("perf_budget")):
+        driver.perf_recorder = PerfRecorder(
+            request.node.nodeid,
+            browser_name,
+            history_path=config.getoption("--perf-history"),
+        )
+
+
+def _collect_resource_stats(request, driver):
+    """Сохранение статистики ресурсов теста в user_properties."""
+    blocker = getattr(driver, "resource_blocker", None)
+    stats = blocker.collect(driver) if blocker is not None else None
+    if stats is not None:
+        request.node.user_properties.append(("resources", stats))
+
+
+@pytest.fixture
+def base_url(driver):
+    """Фикстура для базового URL."""
+    return driver.base_url
+
+
+@pytest.fixture
+def screenshot(request, driver):
+    """Скриншот для отчета: screenshot("имя"). Один на тест."""
+    service = request.config.pluginmanager.get_plugin("screenshots")
+    return lambda name: service.capture(request.node, driver, name)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Браузер теста в отчетах всех фаз для истории длительностей и
+    сводки матрицы, в том числе если браузер не удалось запустить.
+    """
+    report = yield
+    if "driver" in item.fixturenames:
+        callspec = getattr(item, "callspec", None)
+        browser = (callspec.params.get("browser_name") if callspec else None)
+        if browser is None:
+            browser = parse_browsers(item.config.getoption("--browser"))[0]
+        report.user_properties.append(("browser", browser))
+    return report
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """Метрики страниц в Allure и проверка бюджетов perf_budget."""
+    result = yield
+    recorder = getattr(item.funcargs.get("driver"), "perf_recorder", None)
+    if recorder is None or not recorder.navigations:
+        return result
+
+    import allure
+
+    allure.attach(
+        json.dumps(recorder.navigations, indent=2, ensure_ascii=False),
+        name="page_metrics", attachment_type=allure.attachment_type.JSON)
+
+    budgets = [
+        (marker.args[0] if marker.args else None, marker.kwargs)
+        for marker in item.iter_markers("perf_budget")
+    ]
+    violations = recorder.violations(budgets)
+    if violations:
+        pytest.fail("Превышены бюджеты производительности:\n"
+                    + "\n".join(violations))
+    return result
+
+
+def pytest_configure(config):
+    browsers = parse_browsers(config.getoption("--browser"))
+    if len(browsers) > 1:
+        config.pluginmanager.register(
+            BrowserMatrixReport(browsers), "browser-matrix")
+
+    config.addinivalue_line(
+        "markers",
+        "perf_budget(page=None, **limits): бюджеты метрик страницы "
+        "(ttfb, dom_content_loaded, load, fcp, lcp - мс; cls; "
+        "transfer_size - байты; requests)")
+
+    config.pluginmanager.register(
+        ScreenshotService.from_config(config), "screenshots")
+
+    profile_path = config.getoption("--webdriver-profile")
+    if profile_path:
+        config.pluginmanager.register(
+            ProfileReport(config, profile_path), "webdriver-profile")
+
+    types = config.getoption("--block-resources")
+    if types is not None:
+        unknown = set(types.split(",")) - set(RESOURCE_PATTERNS) - {"none"}
+        if unknown:
+            raise pytest.UsageError(
+                f"--block-resources: неизвестные типы {sorted(unknown)}; "
+                "значение указывается через '=', "
+                "например --block-resources=image,media")
+        if types == "none" and getattr(config, "cache", None) is None:
+            raise pytest.UsageError(
+                "--block-resources=none: базовый запуск хранится в кэше "
+                "pytest, он отключен (-p no:cacheprovider)")
+        config.pluginmanager.register(
+            ResourceReport(config), "resource-report")
@@ -0,0 +1,187 @@
+import re
+import time
+from contextlib import nullcontext
+
+import pytest
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+
+# Поля страницы для распознавания капчи и страниц ошибок: общий фрагмент
+# PAGE_SIGNATURE_SCRIPT и снимка элементов page-объектов
+PAGE_FIELDS_SCRIPT = """
+const navigation = performance.getEntriesByType("navigation")[0];
+const page = {
+    url: location.href,
+    title: document.title,
+    text: document.body ? document.body.innerText.slice(0, 3000) : "",
+    status: navigation && navigation.responseStatus || ""
+};
+"""
+
+# Снимок страницы для распознавания капчи и страниц ошибок за один запрос
+PAGE_SIGNATURE_SCRIPT = PAGE_FIELDS_SCRIPT + "return page;\n"
+
+# (категория, действие, поля снимка, признак). Код 5xx берем из статуса
+# ответа страницы, а в заголовке - только вместе со словом ошибки:
+# числа вроде «(500) дней лета» встречаются и в названиях фильмов
+BLOCK_SIGNATURES = [
+    ("captcha", "skip", ("url",), r"showcaptcha|smartcaptcha"),
+    ("captcha", "skip", ("title", "text"),
+     r"я не робот|подтвердите, что запросы отправляли вы"),
+    ("blocked", "xfail", ("title", "text"),
+     r"access denied|403 forbidden|доступ (запрещ|ограничен)"
+     r"|your request has been blocked"),
+    ("server_error", "retry", ("status",), r"^50[0-4]$"),
+    ("server_error", "retry", ("title",),
+     r"\b50[0-4]\b.*(error|ошибка)|(error|ошибка).*\b50[0-4]\b"
+     r"|internal server error|bad gateway"
+     r"|service unavailable|gateway time-?out"),
+]
+
+
+class PageBlocked(Exception):
+    """Страница заменена капчей, ошибкой сервера или блокировкой."""
+
+    def __init__(self, category, action, reason):
+        super().__init__(f"{category}: {reason}")
+        self.category = category
+        self.action = action
+        self.reason = reason
+
+    def abort(self):
+        """Завершение теста в соответствии с категорией."""
+        message = f"Кинопоиск вернул {self.category}: {self.reason}"
+        if self.action == "skip":
+            pytest.skip(message)
+        if self.action == "xfail":
+            pytest.xfail(message)
+        pytest.fail(message)
+
+
+def detect_block(driver):
+    """PageBlocked для капчи/ошибки/блокировки или None."""
+    try:
+        page = driver.execute_script(PAGE_SIGNATURE_SCRIPT) or {}
+    except Exception:
+        return None
+    return match_block(page)
+
+
+def match_block(page):
+    """Поиск признаков капчи/ошибки в уже снятом снимке страницы."""
+    for category, action, fields, pattern in BLOCK_SIGNATURES:
+        for field in fields:
+            if re.search(pattern, str(page.get(field, "")).lower()):
+                return PageBlocked(category, action, f"{field} ~ {pattern}")
+    return None
+
+
+class WaitEngine:
+    """Ожидание условий для page-объектов.
+
+    Опрашивает условие с растущим интервалом и при каждом неуспехе
+    проверяет, не показан ли вместо страницы капча или ошибка. В этом
+    случае тест сразу пропускается (капча), помечается xfail (блокировка)
+    или страница перезагружается с backoff (5xx), а не ждет весь таймаут.
+    На время ожидания неявное ожидание драйвера отключается, чтобы каждый
+    опрос не висел до implicitly_wait. После успешного ожидания страница
+    сохраняется в снимки DOM, если у драйвера есть dom_recorder.
+    """
+
+    ignored_exceptions = (
+        NoSuchElementException,
+        StaleElementReferenceException,
+    )
+
+    def __init__(self, driver, timeout=30, interval=0.1, max_interval=1.0,
+                 backoff=1.5, retries=2):
+        self.driver = driver
+        self.timeout = timeout
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.retries = retries
+        # Страница без браузера (снимок DOM) не меняется между опросами
+        self.static = getattr(driver, "static", False)
+
+    def until(self, condition, message="", page=None, label="until"):
+        """Значение condition(driver), как только оно истинно.
+
+        page - функция, возвращающая снимок страницы, уже снятый условием
+        (url/title/text); тогда проверка на капчу не делает лишний запрос.
+        label - имя ожидания в профиле WebDriver.
+        """
+        profiler = getattr(self.driver, "profiler", None)
+        with profiler.waiting(label) if profiler else nullcontext():
+            implicit_wait = self._implicit_wait()
+            self.driver.implicitly_wait(0)
+            try:
+                value = self._poll(condition, message, page)
+            finally:
+                self.driver.implicitly_wait(implicit_wait)
+        recorder = getattr(self.driver, "dom_recorder", None)
+        if recorder is not None:
+            recorder.capture(self.driver)
+        return value
+
+    def check_page(self):
+        """Проверка текущей страницы на капчу и ошибки.
+
+        Ошибка сервера (5xx), как и в until, снимается перезагрузкой
+        страницы с backoff, пока есть попытки.
+        """
+        interval = self.interval
+        retries = self.retries
+        while True:
+            block = detect_block(self.driver)
+            if block is None:
+                return
+            retries = self._recover(block, retries, interval)
+            interval = min(interval * self.backoff, self.max_interval)
+
+    def _recover(self, block, retries, interval):
+        """Перезагрузка страницы при ошибке сервера или завершение теста.
+
+        Возвращает оставшееся число перезагрузок.
+        """
+        if block.action != "retry" or not retries:
+            block.abort()
+        time.sleep(interval)
+        self.driver.refresh()
+        return retries - 1
+
+    def _poll(self, condition, message, page):
+        deadline = time.monotonic() + self.timeout
+        interval = self.interval
+        retries = self.retries
+
+        while True:
+            try:
+                value = condition(self.driver)
+                if value:
+                    return value
+            except self.ignored_exceptions:
+                pass
+
+            snapshot = page() if page is not None else None
+            if snapshot:
+                block = match_block(snapshot)
+            else:
+                block = detect_block(self.driver)
+            if block is not None:
+                retries = self._recover(block, retries, interval)
+
+            if time.monotonic() >= deadline or self.static:
+                raise TimeoutException(message)
+            time.sleep(min(interval, max(deadline - time.monotonic(), 0)))
+            interval = min(interval * self.backoff, self.max_interval)
+
+    def _implicit_wait(self):
+        try:
+            return self.driver.timeouts.implicit_wait
+        except Exception:
+            return 0
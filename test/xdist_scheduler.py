@@ -0,0 +1,89 @@
+from xdist.scheduler import LoadScheduling
+
+from duration_history import (
+    DurationHistory, assign_engines, pick, predict_makespan,
+)
+
+
+class DurationScheduling(LoadScheduling):
+    """Распределение тестов xdist по истории длительностей.
+
+    Тесты раздаются по одному, от самых долгих к коротким, воркеру,
+    который освободился первым. Тесты каждого браузера (chrome, firefox,
+    edge в матрице --browser) закреплены за своими воркерами по доле их
+    времени в прогоне, чтобы шли в уже запущенном браузере при
+    --driver-scope=worker, а не поднимали его на каждом воркере.
+    """
+
+    def __init__(self, config, log=None):
+        super().__init__(config, log)
+        self.history = DurationHistory(config.cache)
+        self.node_engines = {}
+        self.engines = {}
+        self.predicted = None
+
+    def schedule(self):
+        assert self.collection_is_completed
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = next(iter(self.node2collection.values()))
+        estimates = {
+            nodeid: self.history.estimate(nodeid)
+            for nodeid in self.collection}
+        self.engines = {
+            nodeid: self.history.engine(nodeid)
+            for nodeid in self.collection}
+        self.pending[:] = sorted(
+            range(len(self.collection)),
+            key=lambda index: estimates[self.collection[index]],
+            reverse=True)
+
+        nodes = sorted(self.nodes, key=lambda node: node.gateway.id)
+        assignment = assign_engines(estimates, self.engines, len(nodes))
+        self.node_engines = dict(zip(nodes, assignment))
+        self.predicted = predict_makespan(
+            estimates, self.engines, assignment)
+        report = self.config.pluginmanager.get_plugin("duration-report")
+        if report is not None:
+            report.predicted = self.predicted
+
+        for node in nodes:
+            self.check_schedule(node)
+
+    def check_schedule(self, node, duration=0):
+        """Догрузка воркера до двух тестов в очереди.
+
+        Второй тест нужен воркеру как nextitem для teardown; больше не
+        отправляется, чтобы длинные тесты не застревали в очереди
+        занятого воркера.
+        """
+        if node.shutting_down:
+            return
+        queue = self.node2pending[node]
+        engine = self.node_engines.get(node)
+        orphans = self._orphan_engines()
+        while len(queue) < 2:
+            index = pick(self.pending, engine, self._engine, orphans)
+            if index is None:
+                break
+            self.pending.remove(index)
+            queue.append(index)
+            node.send_runtest_some([index])
+        if pick(self.pending, engine, self._engine, orphans) is None:
+            node.shutdown()
+
+    def _engine(self, index):
+        return self.engines[self.collection[index]]
+
+    def _orphan_engines(self):
+        # Браузеры, все воркеры которых упали, может взять любой воркер
+        alive = {
+            engine for node, engine in self.node_engines.items()
+            if node in self.node2pending}
+        return set(self.engines.values()) - alive - {None}